@@ -0,0 +1,290 @@
+"""
+주파수 영역 자산 분석 - 백그라운드 분석 작업
+
+Streamlit 스크립트 스레드를 막지 않도록 분석 파이프라인을 워커 풀에서 실행하고
+단계별/자산별 진행 상황을 작업 객체에 기록합니다. 작업 관리자는 서버 프로세스에
+하나만 두고(st.cache_resource) 모든 세션이 공유하므로, 브라우저 연결이 끊기거나
+페이지를 새로 고쳐도 작업 ID로 결과를 다시 가져올 수 있습니다.
+
+수익률은 ReturnsStore의 키로 전달되어 워커가 memmap으로 직접 엽니다.
+"""
+
+import hashlib
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from freq_domain_asset_analysis import FrequencyDomainAnalyzer, ReturnsStore
+
+# 파이프라인 단계 (진행률은 단계 순서 + 단계 안의 자산 진행으로 계산)
+STAGES = OrderedDict([
+    ('summary', '요약 리포트 및 상관계수'),
+    ('volatility', '주파수별 변동성'),
+    ('stl', 'STL 분해'),
+])
+
+
+def result_key(returns_hash: str, sampling_frequency: str,
+               freq_bands: Tuple, filter_order: int) -> str:
+    """분석 결과 식별용 해시 (수익률 내용 해시 + 데이터 주기 + 대역 설정)"""
+    return hashlib.blake2b(
+        repr((returns_hash, sampling_frequency, freq_bands, filter_order)).encode('utf-8'),
+        digest_size=16
+    ).hexdigest()
+
+
+def analyze_returns(returns: pd.DataFrame, returns_hash: str, sampling_frequency: str,
+                    freq_bands: Tuple, filter_order: int,
+                    progress: Callable[[str, int, int], None] = None) -> Dict:
+    """
+    앱의 분석 파이프라인 (요약 리포트, 대역별 상관계수, 변동성, STL)
+
+    Parameters:
+    -----------
+    returns : pd.DataFrame
+        자산들의 수익률
+    returns_hash : str
+        수익률 내용 해시 (결과 키 생성용)
+    sampling_frequency : str
+        데이터 빈도 ('D' 또는 'M')
+    freq_bands : Tuple
+        (대역 이름, (low, high)) 튜플
+    filter_order : int
+        필터 차수
+    progress : Callable, optional
+        progress(단계, 완료 수, 전체 수) 콜백
+
+    Returns:
+    --------
+    results : Dict
+        summary, correlation, band_correlations, volatility, stl_summary,
+        stl_decomposed, profile, result_key, settings.
+        analyzer(스펙트럼/대역 분해 캐시)는 서버에 오래 남고 세션 간 공유되므로 포함하지 않음
+    """
+    def report(stage, done, total):
+        if progress is not None:
+            progress(stage, done, total)
+
+    analyzer = FrequencyDomainAnalyzer(sampling_frequency=sampling_frequency)
+    analyzer.freq_bands = dict(freq_bands)
+    analyzer.filter_order = filter_order
+    analyzer.progress_callback = report
+
+    # 대역별 상관계수 행렬도 함께 계산 (상관계수 탭의 자산 쌍 선택은 조회만 수행)
+    report('summary', 0, 1)
+    summary_df, corr_matrix, band_correlations = analyzer.generate_summary_report(
+        returns, include_band_correlations=True
+    )
+    report('summary', 1, 1)
+
+    # 주파수별 변동성 데이터 (차트용)
+    report('volatility', 0, 1)
+    vol_table = analyzer.calculate_volatility_spectral(returns)
+    vol_df = pd.DataFrame({
+        '자산': vol_table.index,
+        '단기 (5일~3개월)': vol_table['short_term'].values * 100,
+        '중기 (3개월~1년)': vol_table['medium_term'].values * 100,
+        '경기순환 (1~5년)': vol_table['business_cycle'].values * 100,
+        '장기추세 (5년+)': vol_table['long_term'].values * 100
+    })
+    report('volatility', 1, 1)
+
+    # STL 분해 (자산당 1회 - 요약 통계와 차트 데이터를 같은 결과로 생성, 자산마다 진행 보고)
+    report('stl', 0, len(returns.columns))
+    stl_summary, stl_decomposed = analyzer.generate_stl_summary(returns, return_decomposed=True)
+
+    analyzer.progress_callback = None
+
+    return {
+        'summary': summary_df,
+        'correlation': corr_matrix,
+        'band_correlations': band_correlations,
+        'volatility': vol_df,
+        'stl_summary': stl_summary,
+        'stl_decomposed': stl_decomposed,
+        # 메서드별 실행 시간 (같은 작업을 다시 조회하면 처음 분석할 때의 기록)
+        'profile': analyzer.profiler.to_dict(),
+        # 결과 식별용 해시 (Excel 내보내기 캐시 키)
+        'result_key': result_key(returns_hash, sampling_frequency, freq_bands, filter_order),
+        # 분석 설정 (Excel 내보내기에서 같은 설정의 analyzer로 대역 분해)
+        'settings': {
+            'sampling_frequency': sampling_frequency,
+            'freq_bands': freq_bands,
+            'filter_order': filter_order
+        }
+    }
+
+
+class AnalysisJob:
+    """
+    백그라운드 분석 작업 하나의 상태
+
+    status: 'queued' → 'running' → 'done' 또는 'failed'
+    진행 상황 필드는 워커 스레드가 갱신하고 스크립트 스레드는 읽기만 함
+    """
+
+    def __init__(self, key: str, returns_key: str, sampling_frequency: str,
+                 freq_bands: Tuple, filter_order: int):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.returns_key = returns_key
+        self.sampling_frequency = sampling_frequency
+        self.freq_bands = freq_bands
+        self.filter_order = filter_order
+
+        self.status = 'queued'
+        self.stage = None
+        self.done = 0
+        self.total = 0
+        self.results = None
+        self.error = ''
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def report(self, stage: str, done: int, total: int):
+        """파이프라인 진행 상황 기록 (analyze_returns의 progress 콜백)"""
+        self.stage, self.done, self.total = stage, done, total
+
+    @property
+    def fraction(self) -> float:
+        """전체 진행률 (0~1)"""
+        if self.status == 'done':
+            return 1.0
+        if self.stage not in STAGES:
+            return 0.0
+        stage_index = list(STAGES).index(self.stage)
+        within = self.done / self.total if self.total else 0.0
+        return min((stage_index + within) / len(STAGES), 1.0)
+
+    @property
+    def message(self) -> str:
+        """진행 상황 표시 문구"""
+        if self.status == 'queued':
+            return "대기 중..."
+        if self.status == 'done':
+            return "분석 완료"
+        if self.status == 'failed':
+            return f"분석 실패: {self.error}"
+        label = STAGES.get(self.stage, '준비')
+        if self.total > 1:
+            return f"{label} ({self.done}/{self.total} 자산)"
+        return f"{label}..."
+
+
+class JobManager:
+    """
+    백그라운드 분석 작업 관리자 (서버 프로세스당 1개, 모든 세션이 공유)
+
+    같은 결과 키(수익률 + 설정)의 작업이 진행 중이거나 완료되어 있으면 새로 실행하지 않고
+    그 작업을 돌려주므로, 완료된 작업 목록이 세션 간 결과 캐시 역할을 함.
+    완료된 작업은 끝난 지 ttl초가 지나면 제거하고, 최대 max_jobs개까지 보관 (오래된 순으로 제거)
+    """
+
+    def __init__(self, store: ReturnsStore, max_workers: int = 2, max_jobs: int = 16,
+                 ttl: float = 60 * 60):
+        """
+        Parameters:
+        -----------
+        store : ReturnsStore
+            수익률 저장소 (워커가 returns_key로 memmap을 엶)
+        max_workers : int
+            동시에 실행할 분석 작업 수
+        max_jobs : int
+            보관할 완료 작업 수
+        ttl : float
+            완료된 작업을 보관하는 시간 (초)
+        """
+        self.store = store
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='analysis-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """작업 ID로 조회 (없거나 제거되었으면 None)"""
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def active_returns_keys(self) -> Set[str]:
+        """대기 중이거나 실행 중인 작업의 수익률 키 (저장소 정리에서 제외할 데이터셋)"""
+        with self._lock:
+            return {job.returns_key for job in self._jobs.values() if not job.finished}
+
+    def submit(self, returns_key: str, sampling_frequency: str,
+               freq_bands: Tuple, filter_order: int) -> AnalysisJob:
+        """
+        분석 작업 제출 (같은 결과 키의 작업이 실패하지 않았으면 그 작업을 반환)
+
+        Parameters:
+        -----------
+        returns_key : str
+            ReturnsStore에 저장된 수익률 키 (내용 해시)
+        sampling_frequency, freq_bands, filter_order
+            analyze_returns 설정
+
+        Returns:
+        --------
+        job : AnalysisJob
+            제출되었거나 재사용된 작업
+        """
+        key = result_key(returns_key, sampling_frequency, freq_bands, filter_order)
+
+        with self._lock:
+            self._evict()
+            for job in self._jobs.values():
+                if job.key == key and job.status != 'failed':
+                    self._jobs.move_to_end(job.job_id)
+                    return job
+
+            job = AnalysisJob(key, returns_key, sampling_frequency, freq_bands, filter_order)
+            self._jobs[job.job_id] = job
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def _evict(self):
+        """
+        완료 후 ttl초가 지난 작업과 max_jobs개를 넘는 오래된 완료 작업 제거
+        (진행 중인 작업은 유지, _lock을 잡은 상태에서 호출)
+        """
+        now = time.time()
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and now - job.finished_at > self.ttl]:
+            del self._jobs[job_id]
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.max_jobs, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: AnalysisJob):
+        """워커 스레드에서 작업 실행"""
+        job.status = 'running'
+        try:
+            returns = self.store.open(job.returns_key)
+            job.results = analyze_returns(
+                returns, job.returns_key, job.sampling_frequency,
+                job.freq_bands, job.filter_order, progress=job.report
+            )
+            # finished_at을 먼저 기록 (완료 상태가 보이는 시점에 _evict가 경과 시간을 계산할 수 있도록)
+            job.finished_at = time.time()
+            job.status = 'done'
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.finished_at = time.time()
+            job.status = 'failed'
+            traceback.print_exc()
+        with self._lock:
+            self._evict()
@@ -2,6 +2,9 @@
 주파수 영역 자산 분석 시스템 - Streamlit UI
 """
 
+import json
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -9,10 +12,26 @@ from io import BytesIO
 import plotly.graph_objects as go
 import plotly.express as px
 
-from freq_domain_asset_analysis import FrequencyDomainAnalyzer, setup_korean_font
-
-# 한글 폰트 설정
-setup_korean_font()
+from freq_domain_asset_analysis import (
+    FrequencyDomainAnalyzer, ReturnsStore, SUPPORTED_EXTENSIONS, load_returns, list_return_columns,
+    read_returns_chunked
+)
+from analysis_jobs import JobManager
+
+# 대용량 파일 설정: 이 크기를 넘는 CSV/Parquet는 행 블록 단위로 읽음
+LARGE_FILE_MB = 50
+READ_MEMORY_LIMIT_MB = 256
+# 업로드 데이터 저장소 상한: 전체 크기와 미사용 기간 (넘으면 오래전에 사용한 데이터부터 삭제)
+RETURNS_STORE_MAX_MB = 2048
+RETURNS_STORE_MAX_DAYS = 7
+# 분석 작업 진행 상황을 다시 확인하는 간격 (초)
+JOB_POLL_SECONDS = 0.5
+# "전체 데이터 보기"에 표시할 최대 행 수
+MAX_DISPLAY_ROWS = 5000
+# Excel 내보내기: 한 번에 시트에 쓰는 행 수
+EXCEL_CHUNK_ROWS = 2000
+# STL 차트: 시계열 하나당 브라우저로 보내는 최대 점 수 (화면 픽셀 예산)
+STL_MAX_POINTS = 2000
 
 # 페이지 설정
 st.set_page_config(
@@ -65,8 +84,146 @@ if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = None
 if 'returns_df' not in st.session_state:
     st.session_state.returns_df = None
+if 'returns_key' not in st.session_state:
+    st.session_state.returns_key = None
+if 'upload_key' not in st.session_state:
+    st.session_state.upload_key = None
 if 'selected_stl_asset' not in st.session_state:
     st.session_state.selected_stl_asset = None
+if 'excel_request' not in st.session_state:
+    st.session_state.excel_request = None
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = None
+
+
+# 업로드 데이터 저장소 (모든 세션이 공유하는 memmap 파일, 내용 해시별 1벌)
+@st.cache_resource
+def get_returns_store():
+    return ReturnsStore()
+
+
+# 백그라운드 분석 작업 관리자 (모든 세션이 공유, 같은 데이터/설정의 결과는 작업 목록에서 재사용)
+@st.cache_resource
+def get_job_manager():
+    return JobManager(get_returns_store())
+
+
+def store_returns(df):
+    """
+    수익률을 저장소에 저장하고 상한을 넘는 오래된 데이터셋 정리
+    (방금 저장한 데이터와 대기/실행 중인 작업의 데이터는 유지)
+    """
+    returns_store = get_returns_store()
+    key = returns_store.put(df)
+    returns_store.prune(max_bytes=RETURNS_STORE_MAX_MB * 1024 ** 2,
+                        max_age_seconds=RETURNS_STORE_MAX_DAYS * 24 * 60 * 60,
+                        keep={key} | get_job_manager().active_returns_keys())
+    return key
+
+
+# 새로 고침/재접속: URL에 남긴 데이터 키(내용 해시)와 작업 ID로 저장소의 데이터와 작업 복원
+query_data_key = st.query_params.get('data', '')
+if (st.session_state.returns_df is None and query_data_key.isalnum()
+        and query_data_key in get_returns_store()):
+    st.session_state.returns_key = query_data_key
+    st.session_state.returns_df = get_returns_store().open(query_data_key)
+    query_job = get_job_manager().get(st.query_params.get('job'))
+    if query_job is not None and query_job.returns_key == query_data_key:
+        st.session_state.job_id = query_job.job_id
+
+
+def append_frame(worksheet, frame, index=True, index_label=''):
+    """DataFrame을 write-only 시트에 행 블록 단위로 추가 (헤더 + 값, NaN은 빈 셀)"""
+    header = [index_label] if index else []
+    worksheet.append(header + [str(column) for column in frame.columns])
+
+    for start in range(0, len(frame), EXCEL_CHUNK_ROWS):
+        chunk = frame.iloc[start:start + EXCEL_CHUNK_ROWS]
+        rows = chunk.astype(object).where(chunk.notna(), None).to_numpy().tolist()
+        if index:
+            labels = chunk.index
+            if isinstance(labels, pd.DatetimeIndex):
+                labels = labels.to_pydatetime()
+            for label, row in zip(labels, rows):
+                worksheet.append([label] + row)
+        else:
+            for row in rows:
+                worksheet.append(row)
+
+
+def lttb_indices(values, n_out):
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링으로 남길 점의 위치
+
+    구간마다 이전 선택점/다음 구간 평균과 만드는 삼각형 넓이가 가장 큰 점을 골라
+    피크와 급변 구간의 모양을 유지함 (x는 등간격 위치로 간주)
+    """
+    n = len(values)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    y = np.where(np.isfinite(values), values, 0.0)
+    every = (n - 2) / (n_out - 2)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        if end < next_end:
+            avg_x = 0.5 * (end + next_end - 1)
+            avg_y = y[end:next_end].mean()
+        else:
+            avg_x, avg_y = n - 1, y[n - 1]
+
+        positions = np.arange(start, end)
+        area = np.abs((a - avg_x) * (y[start:end] - y[a]) - (a - positions) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample_series(series, view, n_out=STL_MAX_POINTS):
+    """series의 view 구간을 LTTB로 n_out개 점으로 줄여 trace의 x, y 인자로 반환"""
+    values = series.to_numpy(dtype=np.float64)[view]
+    positions = lttb_indices(values, n_out)
+    return dict(x=series.index[view][positions], y=values[positions])
+
+
+# Excel 리포트 (다운로드를 요청했을 때만 생성, 결과 해시별로 캐시)
+# openpyxl write-only 모드: 행을 임시 파일로 흘려 쓰므로 시트 크기와 무관하게 메모리 일정
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_excel_report(result_key, include_bands, _results, _returns):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+
+    # 요약 통계 / 상관계수 / 변동성 분해
+    append_frame(workbook.create_sheet('요약통계'), _results['summary'], index=False)
+    append_frame(workbook.create_sheet('상관계수'), _results['correlation'])
+    append_frame(workbook.create_sheet('변동성분해'), _results['volatility'], index=False)
+
+    # 대역별 분해 시계열 (대역마다 시트 1개: 날짜 × 자산)
+    # 분석 때와 같은 설정의 새 analyzer로 분해 (분해 캐시는 이 호출이 끝나면 해제)
+    if include_bands:
+        settings = _results['settings']
+        analyzer = FrequencyDomainAnalyzer(sampling_frequency=settings['sampling_frequency'])
+        analyzer.freq_bands = dict(settings['freq_bands'])
+        analyzer.filter_order = settings['filter_order']
+        cube = analyzer.decompose_frequency_bands(_returns)
+        for i, band_name in enumerate(analyzer.freq_bands.keys()):
+            band_frame = pd.DataFrame(cube[i], index=_returns.index,
+                                      columns=_returns.columns, copy=False)
+            append_frame(workbook.create_sheet(f'분해_{band_name}'[:31]), band_frame,
+                         index_label='날짜')
+
+    output = BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
 
 # 사이드바 - 프로그램 소개
 with st.sidebar:
@@ -134,11 +291,22 @@ with st.sidebar:
         freq_label = "월별"
 
     uploaded_file = st.file_uploader(
-        f"CSV 또는 Excel 파일을 업로드하세요 ({freq_label})",
-        type=['csv', 'xlsx', 'xls'],
+        f"CSV, Excel, Parquet 또는 Feather 파일을 업로드하세요 ({freq_label})",
+        type=[extension.lstrip('.') for extension in SUPPORTED_EXTENSIONS],
         help="날짜를 인덱스로, 자산 수익률을 컬럼으로 하는 파일을 업로드하세요"
     )
 
+    # 분석할 자산 선택 (Parquet/Feather는 선택한 컬럼만 읽음)
+    selected_assets = None
+    if uploaded_file is not None:
+        available_assets = list_return_columns(uploaded_file, name=uploaded_file.name)
+        selected_assets = st.multiselect(
+            "분석할 자산 선택",
+            available_assets,
+            default=available_assets,
+            help="선택한 자산만 읽어서 분석합니다"
+        )
+
     st.divider()
 
     # 데이터 형식 가이드 (접을 수 있게)
@@ -193,11 +361,33 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
     try:
         # 파일 읽기 또는 세션 데이터 사용
         if uploaded_file is not None:
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file, index_col=0, parse_dates=True)
-            else:
-                df = pd.read_excel(uploaded_file, index_col=0, parse_dates=True)
-            st.session_state.returns_df = df
+            if not selected_assets:
+                st.warning("👈 분석할 자산을 하나 이상 선택하세요.")
+                st.stop()
+
+            # 같은 업로드/자산 선택이면 다시 파싱하지 않고 저장소의 memmap 재사용
+            upload_key = (uploaded_file.file_id, tuple(selected_assets))
+            returns_store = get_returns_store()
+            if (st.session_state.upload_key != upload_key
+                    or st.session_state.returns_key not in returns_store):
+                columns = None if len(selected_assets) == len(available_assets) else selected_assets
+                if uploaded_file.size > LARGE_FILE_MB * 1024 ** 2:
+                    # 대용량 파일: 블록 단위로 검증/변환하여 메모리 상한 내에서 읽기
+                    df = read_returns_chunked(
+                        uploaded_file,
+                        name=uploaded_file.name,
+                        columns=columns,
+                        memory_limit_mb=READ_MEMORY_LIMIT_MB
+                    )
+                else:
+                    df = load_returns(uploaded_file, name=uploaded_file.name, columns=columns)
+
+                # 내용 해시별로 한 번만 디스크에 저장 (다른 세션과 공유)
+                st.session_state.returns_key = store_returns(df)
+                st.session_state.upload_key = upload_key
+                st.session_state.returns_df = returns_store.open(st.session_state.returns_key)
+
+            df = st.session_state.returns_df
         else:
             df = st.session_state.returns_df
 
@@ -226,7 +416,11 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
 
         # 전체 데이터 보기
         with st.expander("📋 전체 데이터 보기"):
-            st.dataframe(df, width='stretch', height=400)
+            if len(df) > MAX_DISPLAY_ROWS:
+                st.caption(f"전체 {len(df):,}행 중 최근 {MAX_DISPLAY_ROWS:,}행만 표시합니다.")
+                st.dataframe(df.tail(MAX_DISPLAY_ROWS), width='stretch', height=400)
+            else:
+                st.dataframe(df, width='stretch', height=400)
 
         st.divider()
 
@@ -241,51 +435,44 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
                 width="stretch"  # Note: Streamlit buttons don't use width parameter
             )
 
-        # 분석 실행
+        # 분석 실행: 백그라운드 작업으로 제출 (같은 데이터/설정이면 기존 작업의 결과 재사용)
         if analyze_button:
-            with st.spinner('분석 중... 잠시만 기다려주세요 ⏳'):
-                try:
-                    # Analyzer 초기화 (선택한 데이터 주기 사용)
-                    analyzer = FrequencyDomainAnalyzer(sampling_frequency=st.session_state.data_frequency)
-
-                    # 분석 실행
-                    summary_df, corr_matrix = analyzer.generate_summary_report(df)
-
-                    # 주파수별 변동성 데이터 수집 (차트용)
-                    volatility_data = []
-                    for asset in df.columns:
-                        vol = analyzer.calculate_volatility_spectral(df[asset])
-                        volatility_data.append({
-                            '자산': asset,
-                            '단기 (5일~3개월)': vol['short_term'] * 100,
-                            '중기 (3개월~1년)': vol['medium_term'] * 100,
-                            '경기순환 (1~5년)': vol['business_cycle'] * 100,
-                            '장기추세 (5년+)': vol['long_term'] * 100
-                        })
-
-                    vol_df = pd.DataFrame(volatility_data)
-
-                    # STL 분해 추가
-                    stl_summary = analyzer.generate_stl_summary(df)
-                    stl_decomposed = {}
-                    for asset in df.columns:
-                        stl_decomposed[asset] = analyzer.stl_decomposition(df[asset])
-
-                    # 세션에 저장
-                    st.session_state.analysis_results = {
-                        'summary': summary_df,
-                        'correlation': corr_matrix,
-                        'volatility': vol_df,
-                        'stl_summary': stl_summary,
-                        'stl_decomposed': stl_decomposed,
-                        'analyzer': analyzer
-                    }
-
-                    st.success('✅ 분석 완료!')
-
-                except Exception as e:
-                    st.error(f"❌ 분석 중 오류가 발생했습니다: {str(e)}")
-                    st.exception(e)
+            # Analyzer 기본 설정 (선택한 데이터 주기 사용)
+            analyzer = FrequencyDomainAnalyzer(sampling_frequency=st.session_state.data_frequency)
+            if (st.session_state.returns_key is None
+                    or st.session_state.returns_key not in get_returns_store()):
+                st.session_state.returns_key = store_returns(df)
+
+            job = get_job_manager().submit(
+                st.session_state.returns_key,
+                analyzer.sampling_freq,
+                tuple(analyzer.freq_bands.items()),
+                analyzer.filter_order
+            )
+            st.session_state.job_id = job.job_id
+            st.session_state.analysis_results = None
+
+            # 새로 고침해도 같은 작업을 이어서 볼 수 있도록 URL에 기록
+            st.query_params['data'] = st.session_state.returns_key
+            st.query_params['job'] = job.job_id
+
+        # 작업 진행 상황 (완료될 때까지 주기적으로 다시 실행하여 갱신)
+        if st.session_state.job_id is not None and st.session_state.analysis_results is None:
+            job = get_job_manager().get(st.session_state.job_id)
+            if job is None:
+                # 서버 재시작 등으로 작업 기록이 사라진 경우
+                st.warning("이전 분석 작업을 찾을 수 없습니다. 다시 분석을 실행하세요.")
+                st.session_state.job_id = None
+            elif job.status == 'done':
+                st.session_state.analysis_results = job.results
+                st.success('✅ 분석 완료!')
+            elif job.status == 'failed':
+                st.error(f"❌ 분석 중 오류가 발생했습니다: {job.error}")
+                st.session_state.job_id = None
+            else:
+                st.progress(job.fraction, text=f"분석 중... {job.message}")
+                time.sleep(JOB_POLL_SECONDS)
+                st.rerun()
 
         # 분석 결과 표시
         if st.session_state.analysis_results is not None:
@@ -297,6 +484,32 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
             corr_matrix = results['correlation']
             vol_df = results['volatility']
 
+            # 단계별 실행 시간 (사이드바)
+            with st.sidebar:
+                with st.expander("⏱️ 단계별 실행 시간"):
+                    profile = results['profile']
+                    st.caption(f"전체 {profile['wall_seconds']:.2f}초 (같은 데이터/설정의 재실행은 캐시 사용)")
+
+                    profile_df = pd.DataFrame(profile['methods'])
+                    if not profile_df.empty:
+                        profile_df = profile_df.sort_values('self_seconds', ascending=False)
+                        st.dataframe(
+                            profile_df[['method', 'calls', 'self_seconds', 'total_seconds']].rename(columns={
+                                'method': '메서드', 'calls': '호출 수',
+                                'self_seconds': '자체(초)', 'total_seconds': '누적(초)'
+                            }),
+                            width='stretch',
+                            hide_index=True
+                        )
+
+                    st.download_button(
+                        label="📥 JSON 다운로드",
+                        data=json.dumps(profile, ensure_ascii=False, indent=2),
+                        file_name="analysis_profile.json",
+                        mime="application/json",
+                        width="stretch"
+                    )
+
             # 탭 생성 (STL 탭 추가!)
             tab1, tab2, tab3, tab4 = st.tabs([
                 "📊 요약 통계",
@@ -463,6 +676,25 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
                 # STL 분해 차트 (4개 서브플롯)
                 st.markdown("#### STL 분해 결과 차트")
 
+                # 긴 시계열은 선택한 기간만 화면 해상도에 맞춰 줄여서 표시 (WebGL 렌더링)
+                stl_index = stl_data['original'].index
+                view = slice(0, len(stl_index))
+                if len(stl_index) > STL_MAX_POINTS:
+                    view_start, view_end = st.slider(
+                        "표시 기간",
+                        min_value=stl_index[0].to_pydatetime(),
+                        max_value=stl_index[-1].to_pydatetime(),
+                        value=(stl_index[0].to_pydatetime(), stl_index[-1].to_pydatetime()),
+                        format="YYYY-MM-DD",
+                        key=f"stl_view_{results['result_key']}"
+                    )
+                    view = slice(stl_index.searchsorted(pd.Timestamp(view_start), side='left'),
+                                 stl_index.searchsorted(pd.Timestamp(view_end), side='right'))
+                    st.caption(
+                        f"시계열마다 최대 {STL_MAX_POINTS:,}개 점으로 모양을 보존하며 요약해 표시합니다. "
+                        "기간을 좁히면 해당 구간을 다시 요약하여 세부 변동이 나타납니다."
+                    )
+
                 fig = make_subplots(
                     rows=4, cols=1,
                     subplot_titles=[
@@ -477,29 +709,29 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
 
                 # 원본
                 fig.add_trace(
-                    go.Scatter(x=stl_data['original'].index, y=stl_data['original'].values,
-                              mode='lines', name='Original', line=dict(color='#1f77b4')),
+                    go.Scattergl(**downsample_series(stl_data['original'], view),
+                                mode='lines', name='Original', line=dict(color='#1f77b4')),
                     row=1, col=1
                 )
 
                 # Trend
                 fig.add_trace(
-                    go.Scatter(x=stl_data['trend'].index, y=stl_data['trend'].values,
-                              mode='lines', name='Trend', line=dict(color='#2ca02c', width=2)),
+                    go.Scattergl(**downsample_series(stl_data['trend'], view),
+                                mode='lines', name='Trend', line=dict(color='#2ca02c', width=2)),
                     row=2, col=1
                 )
 
                 # Seasonal
                 fig.add_trace(
-                    go.Scatter(x=stl_data['seasonal'].index, y=stl_data['seasonal'].values,
-                              mode='lines', name='Seasonal', line=dict(color='#ff7f0e')),
+                    go.Scattergl(**downsample_series(stl_data['seasonal'], view),
+                                mode='lines', name='Seasonal', line=dict(color='#ff7f0e')),
                     row=3, col=1
                 )
 
                 # Residual
                 fig.add_trace(
-                    go.Scatter(x=stl_data['residual'].index, y=stl_data['residual'].values,
-                              mode='lines', name='Residual', line=dict(color='#d62728', width=0.5)),
+                    go.Scattergl(**downsample_series(stl_data['residual'], view),
+                                mode='lines', name='Residual', line=dict(color='#d62728', width=0.5)),
                     row=4, col=1
                 )
 
@@ -831,8 +1063,11 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
                         asset2 = st.selectbox("자산 2", df.columns, index=1 if len(df.columns) > 1 else 0, key='asset2')
 
                     if asset1 != asset2:
-                        analyzer = results['analyzer']
-                        freq_corr = analyzer.calculate_correlation_spectral(df[asset1], df[asset2])
+                        # 분석 단계에서 계산한 대역별 상관계수 행렬에서 조회
+                        freq_corr = {
+                            band_name: matrix.at[asset1, asset2]
+                            for band_name, matrix in results['band_correlations'].items()
+                        }
 
                         # 막대 차트
                         freq_corr_df = pd.DataFrame({
@@ -884,27 +1119,30 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
             st.divider()
             st.header("💾 결과 다운로드")
 
-            # Excel 파일 생성
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                # 요약 통계
-                summary_df.to_excel(writer, sheet_name='요약통계', index=False)
-
-                # 상관계수
-                corr_matrix.to_excel(writer, sheet_name='상관계수')
+            # Excel 파일은 요청했을 때만 생성 (차트/선택 변경으로 인한 재실행에서는 만들지 않음)
+            include_bands = st.checkbox(
+                "대역별 분해 시계열 포함",
+                value=False,
+                help="주파수 대역마다 날짜 × 자산 시트를 추가합니다 (데이터가 길면 파일이 커집니다)"
+            )
+            excel_request = (results['result_key'], include_bands)
 
-                # 변동성 분해
-                vol_df.to_excel(writer, sheet_name='변동성분해', index=False)
+            if st.button("📄 Excel 파일 만들기", width="stretch"):
+                st.session_state.excel_request = excel_request
 
-            excel_data = output.getvalue()
+            if st.session_state.excel_request == excel_request:
+                with st.spinner('Excel 파일 생성 중...'):
+                    excel_data = build_excel_report(
+                        results['result_key'], include_bands, results, df
+                    )
 
-            st.download_button(
-                label="📥 Excel 다운로드",
-                data=excel_data,
-                file_name="frequency_domain_analysis.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                width="stretch"
-            )
+                st.download_button(
+                    label="📥 Excel 다운로드",
+                    data=excel_data,
+                    file_name="frequency_domain_analysis.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    width="stretch"
+                )
 
     except Exception as e:
         st.error(f"❌ 파일을 읽는 중 오류가 발생했습니다: {str(e)}")
@@ -912,7 +1150,7 @@ if uploaded_file is not None or st.session_state.returns_df is not None:
 
 else:
     # 파일이 없을 때
-    st.info("👈 왼쪽 사이드바에서 CSV 또는 Excel 파일을 업로드하세요.")
+    st.info("👈 왼쪽 사이드바에서 CSV, Excel, Parquet 또는 Feather 파일을 업로드하세요.")
 
     # 샘플 데이터 생성 버튼
     st.markdown("---")
@@ -997,7 +1235,9 @@ else:
         }
 
         sample_df = pd.DataFrame(returns_data, index=dates)
-        st.session_state.returns_df = sample_df
+        returns_store = get_returns_store()
+        st.session_state.returns_key = store_returns(sample_df)
+        st.session_state.returns_df = returns_store.open(st.session_state.returns_key)
         st.success(f"✅ 금융기관 자산배분 기준 샘플 데이터 생성 완료! ({freq_label}, 5년치, 7개 자산군)")
         st.rerun()
 
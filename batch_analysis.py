@@ -0,0 +1,370 @@
+"""
+주파수 영역 자산 분석 - 배치 실행 CLI
+
+여러 수익률 파일(디렉터리 또는 glob 패턴)을 워커 풀에서 동시에 분석하고
+파일별 결과를 디스크에 저장합니다. 같은 설정으로 완료된 파일은 입력 파일이 바뀌지 않았으면
+다시 실행해도 건너뛰므로 실패한 파일만 재실행됩니다 (resume-on-failure).
+
+사용 예:
+    python batch_analysis.py data/ -o results/ --workers 8
+    python batch_analysis.py "data/*.parquet" -o results/ --freq M
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from freq_domain_asset_analysis import FrequencyDomainAnalyzer, SUPPORTED_EXTENSIONS, load_returns
+
+# 파일 분석이 끝까지 완료되었음을 표시하는 마커 (결과를 모두 쓴 뒤 마지막에 생성)
+# 내용은 run_signature (분석 설정 + 입력 파일 크기/수정 시각)
+SUCCESS_MARKER = '_SUCCESS'
+
+
+def find_input_files(inputs: List[str]) -> List[str]:
+    """
+    디렉터리/glob 패턴/파일 경로 목록을 정렬된 입력 파일 목록으로 변환
+
+    Parameters:
+    -----------
+    inputs : List[str]
+        디렉터리, glob 패턴 또는 파일 경로
+
+    Returns:
+    --------
+    files : List[str]
+        지원하는 확장자의 파일 경로 (중복 제거, 정렬)
+    """
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            candidates = glob.glob(item)
+
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+                files.add(os.path.abspath(path))
+
+    return sorted(files)
+
+
+def common_input_root(files: List[str]) -> str:
+    """입력 파일들의 공통 상위 디렉터리 (결과 디렉터리 이름의 기준)"""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+
+
+def output_dir_for(path: str, output_root: str, input_root: str = None) -> str:
+    """
+    입력 파일별 결과 디렉터리
+
+    input_root 기준 상대 경로로 이름을 정하므로 다른 폴더의 같은 파일 이름이 겹치지 않음
+    (예: data/a/returns.csv → a/returns_csv). input_root가 없으면 파일이 있는 디렉터리 기준
+    """
+    if input_root is None:
+        input_root = os.path.dirname(os.path.abspath(path))
+    stem, suffix = os.path.splitext(os.path.relpath(os.path.abspath(path), input_root))
+    return os.path.join(output_root, f"{stem}_{suffix.lstrip('.').lower()}")
+
+
+def run_signature(path: str, sampling_frequency: str, dtype: str, band_engine: str) -> Dict:
+    """결과를 재사용할 수 있는지 판단하는 기준 (분석 설정 + 입력 파일 크기/수정 시각)"""
+    stat = os.stat(path)
+    return {
+        'sampling_frequency': sampling_frequency,
+        'dtype': dtype,
+        'band_engine': band_engine,
+        'input_size': stat.st_size,
+        'input_mtime_ns': stat.st_mtime_ns
+    }
+
+
+def is_completed(path: str, output_root: str, input_root: str = None,
+                 signature: Dict = None) -> bool:
+    """
+    이전 실행에서 같은 설정과 같은 입력으로 완료된 파일인지 확인
+
+    완료 마커에 기록된 run_signature가 signature와 다르면 (설정 변경, 입력 파일 변경,
+    내용이 없는 이전 형식의 마커) 완료되지 않은 것으로 봄
+    """
+    marker = os.path.join(output_dir_for(path, output_root, input_root), SUCCESS_MARKER)
+    try:
+        with open(marker, 'r', encoding='utf-8') as f:
+            return json.load(f) == signature
+    except (OSError, ValueError):
+        return False
+
+
+def load_completed_record(path: str, output_root: str, input_root: str = None) -> Dict:
+    """
+    건너뛴 파일의 요약 행 (이전 실행의 timing.json에서 소요 시간을 가져옴)
+
+    timing.json을 읽을 수 없으면 파일과 상태만 기록
+    """
+    record = {'file': path, 'status': 'skipped'}
+    try:
+        with open(os.path.join(output_dir_for(path, output_root, input_root), 'timing.json'),
+                  'r', encoding='utf-8') as f:
+            timing = json.load(f)
+    except (OSError, ValueError):
+        return record
+
+    stages = timing.pop('stages', {})
+    timing.pop('profile', None)
+    record.update({key: value for key, value in timing.items() if key not in record})
+    record.update({f'{stage}_seconds': seconds for stage, seconds in stages.items()})
+    return record
+
+
+def analyze_file(path: str, output_root: str, sampling_frequency: str = 'D',
+                 dtype: str = 'float64', band_engine: str = 'filter',
+                 input_root: str = None) -> Dict:
+    """
+    파일 하나를 분석하고 결과를 저장 (워커 프로세스에서 실행)
+
+    dtype='float32'이면 수익률 읽기부터 대역 분해/상관계수까지 단정밀도로 계산하고,
+    band_engine='fft'이면 대역 분해에 FFT 마스크를, 'multirate'이면 저주파 대역에
+    다중 샘플링률 필터를 사용 (FrequencyDomainAnalyzer 참고).
+    결과는 output_dir_for(path, output_root, input_root)에 저장
+
+    저장 파일:
+    - summary.csv, correlation.csv, correlation_<대역>.csv
+    - stl_summary.csv, stl_components.npz (자산별 trend/seasonal/residual)
+    - band_decomposition.npz ((대역 × 시간 × 자산) 배열)
+    - timing.json, _SUCCESS (run_signature)
+
+    Returns:
+    --------
+    record : Dict
+        파일, 상태('done' / 'failed'), 단계별 소요 시간, 데이터 크기, 오류 메시지
+    """
+    record = {'file': path, 'status': 'failed', 'n_obs': 0, 'n_assets': 0,
+              'seconds': 0.0, 'error': ''}
+    timings = {}
+    start = time.perf_counter()
+
+    try:
+        out_dir = output_dir_for(path, output_root, input_root)
+        os.makedirs(out_dir, exist_ok=True)
+
+        # 이전 실행이 중간에 실패했을 수 있으므로 완료 마커부터 제거
+        marker = os.path.join(out_dir, SUCCESS_MARKER)
+        if os.path.exists(marker):
+            os.remove(marker)
+
+        # 읽기 전에 기록 (분석 중 입력 파일이 바뀌면 다음 실행에서 다시 분석)
+        signature = run_signature(path, sampling_frequency, dtype, band_engine)
+
+        t = time.perf_counter()
+        returns = load_returns(path, dtype=np.dtype(dtype))
+        timings['load'] = time.perf_counter() - t
+        record['n_obs'], record['n_assets'] = returns.shape
+
+        analyzer = FrequencyDomainAnalyzer(sampling_frequency=sampling_frequency, dtype=dtype,
+                                           band_engine=band_engine)
+        band_names = list(analyzer.freq_bands.keys())
+
+        # 요약 리포트 + 대역별 상관계수
+        t = time.perf_counter()
+        summary_df, corr_matrix, band_correlations = analyzer.generate_summary_report(
+            returns, include_band_correlations=True
+        )
+        timings['summary_report'] = time.perf_counter() - t
+
+        summary_df.to_csv(os.path.join(out_dir, 'summary.csv'), index=False)
+        corr_matrix.to_csv(os.path.join(out_dir, 'correlation.csv'))
+        for band_name in band_names:
+            band_correlations[band_name].to_csv(
+                os.path.join(out_dir, f'correlation_{band_name}.csv')
+            )
+
+        # 주파수 대역 분해 (요약 리포트에서 계산한 결과 재사용)
+        t = time.perf_counter()
+        cube = analyzer.decompose_frequency_bands(returns)
+        timings['band_decomposition'] = time.perf_counter() - t
+
+        np.savez(
+            os.path.join(out_dir, 'band_decomposition.npz'),
+            bands=np.array(band_names),
+            dates=returns.index.astype(str).to_numpy(),
+            assets=returns.columns.astype(str).to_numpy(),
+            decomposed=cube
+        )
+
+        # STL 분해 (자산당 1회)
+        t = time.perf_counter()
+        stl_summary, stl_decomposed = analyzer.generate_stl_summary(returns, return_decomposed=True)
+        timings['stl'] = time.perf_counter() - t
+
+        stl_summary.to_csv(os.path.join(out_dir, 'stl_summary.csv'), index=False)
+        np.savez(
+            os.path.join(out_dir, 'stl_components.npz'),
+            dates=returns.index.astype(str).to_numpy(),
+            assets=returns.columns.astype(str).to_numpy(),
+            **{
+                component: np.column_stack([
+                    stl_decomposed[asset][component].to_numpy(dtype=np.float64)
+                    for asset in returns.columns
+                ])
+                for component in ('trend', 'seasonal', 'residual')
+            }
+        )
+
+        record['seconds'] = time.perf_counter() - start
+        record['status'] = 'done'
+
+        with open(os.path.join(out_dir, 'timing.json'), 'w', encoding='utf-8') as f:
+            json.dump({**record, 'stages': timings, 'profile': analyzer.profiler.to_dict()},
+                      f, ensure_ascii=False, indent=2)
+
+        # 모든 결과를 쓴 뒤 완료 표시
+        with open(marker, 'w', encoding='utf-8') as f:
+            json.dump(signature, f)
+
+    except Exception as e:
+        record['seconds'] = time.perf_counter() - start
+        record['error'] = f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+
+    record.update({f'{stage}_seconds': seconds for stage, seconds in timings.items()})
+    return record
+
+
+def run_batch(files: List[str], output_root: str, sampling_frequency: str = 'D',
+              workers: int = None, force: bool = False, dtype: str = 'float64',
+              band_engine: str = 'filter') -> pd.DataFrame:
+    """
+    여러 파일을 프로세스 풀에서 동시에 분석
+
+    Parameters:
+    -----------
+    files : List[str]
+        입력 파일 목록
+    output_root : str
+        결과 저장 루트 디렉터리
+    sampling_frequency : str
+        데이터 빈도 ('D' 또는 'M')
+    workers : int, optional
+        워커 프로세스 수 (None이면 CPU 코어 수)
+    force : bool
+        True이면 같은 설정으로 이미 완료된 파일도 다시 분석
+    dtype : str
+        계산 정밀도 ('float64' 또는 'float32')
+    band_engine : str
+        대역 분해 방식 ('filter', 'fft' 또는 'multirate')
+
+    Returns:
+    --------
+    report : pd.DataFrame
+        파일별 상태/소요 시간 요약 (output_root/batch_summary.csv로도 저장,
+        건너뛴 파일은 이전 실행의 소요 시간)
+    """
+    input_root = common_input_root(files)
+
+    # 결과 디렉터리가 겹치면 (예: returns.csv와 returns.CSV) 서로 덮어쓰므로 실행 전에 중단
+    out_dirs = {}
+    for path in files:
+        out_dirs.setdefault(os.path.normcase(output_dir_for(path, output_root, input_root)), []).append(path)
+    duplicates = [paths for paths in out_dirs.values() if len(paths) > 1]
+    if duplicates:
+        raise ValueError("결과 디렉터리가 겹치는 입력 파일이 있습니다: "
+                         + "; ".join(", ".join(paths) for paths in duplicates))
+
+    os.makedirs(output_root, exist_ok=True)
+
+    records = []
+    pending = []
+    for path in files:
+        signature = run_signature(path, sampling_frequency, dtype, band_engine)
+        if not force and is_completed(path, output_root, input_root, signature):
+            records.append(load_completed_record(path, output_root, input_root))
+        else:
+            pending.append(path)
+
+    print(f"입력 파일 {len(files)}개 (분석 {len(pending)}개, 완료되어 건너뜀 {len(files) - len(pending)}개)")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(analyze_file, path, output_root, sampling_frequency,
+                                dtype, band_engine, input_root): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # 워커 프로세스 자체가 죽은 경우
+                    record = {'file': path, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+
+                records.append(record)
+                status = '✅' if record['status'] == 'done' else '❌'
+                print(f"  {status} {os.path.relpath(path, input_root):40s} {record.get('seconds', 0.0):8.2f}s "
+                      f"{record.get('error', '')}")
+
+    report = pd.DataFrame(records)
+    report = report.sort_values('file').reset_index(drop=True)
+    report.to_csv(os.path.join(output_root, 'batch_summary.csv'), index=False)
+
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="수익률 파일 여러 개에 대해 주파수 영역 분석을 배치로 실행"
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help="입력 디렉터리, glob 패턴 또는 파일 경로 ("
+                             + "/".join(extension.lstrip('.') for extension in SUPPORTED_EXTENSIONS) + ")")
+    parser.add_argument('-o', '--output', default='batch_results',
+                        help="결과 저장 디렉터리 (기본값: batch_results)")
+    parser.add_argument('--freq', choices=['D', 'M'], default='D',
+                        help="데이터 빈도 (D: 일별, M: 월별)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="워커 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--force', action='store_true',
+                        help="같은 설정으로 이미 완료된 파일도 다시 분석")
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64',
+                        help="계산 정밀도 (float32: 메모리 절반, 대규모 자산용)")
+    parser.add_argument('--engine', choices=['filter', 'fft', 'multirate'], default='filter',
+                        help="대역 분해 방식 (filter: Zero-Phase 필터, fft: FFT 마스크, "
+                             "multirate: 저주파 대역 데시메이션 후 필터)")
+    args = parser.parse_args(argv)
+
+    files = find_input_files(args.inputs)
+    if not files:
+        print("분석할 파일이 없습니다.")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        report = run_batch(files, args.output, sampling_frequency=args.freq,
+                           workers=args.workers, force=args.force, dtype=args.dtype,
+                           band_engine=args.engine)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    counts = report['status'].value_counts()
+    print("=" * 90)
+    print(f"완료 {counts.get('done', 0)}개 | 건너뜀 {counts.get('skipped', 0)}개 | "
+          f"실패 {counts.get('failed', 0)}개 | 전체 {elapsed:.1f}초")
+    print(f"파일별 소요 시간: {os.path.join(args.output, 'batch_summary.csv')}")
+    if counts.get('failed', 0):
+        print("실패한 파일은 같은 명령을 다시 실행하면 재분석됩니다.")
+
+    return 1 if counts.get('failed', 0) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
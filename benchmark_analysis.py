@@ -0,0 +1,200 @@
+"""
+FrequencyDomainAnalyzer 성능 벤치마크
+
+자산 수(3~2,000)와 데이터 길이(일별 5~40년, 월별)를 바꿔 가며 주요 메서드의
+실행 시간과 최대 메모리 사용량을 측정하고 JSON Lines로 기록합니다.
+
+사용 예:
+    python benchmark_analysis.py --quick
+    python benchmark_analysis.py -o bench.jsonl
+    python benchmark_analysis.py --assets 10 100 --years 10 --freqs D --methods generate_summary_report
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from freq_domain_asset_analysis import FrequencyDomainAnalyzer
+
+DEFAULT_ASSETS = [3, 10, 30, 100, 300, 1000, 2000]
+DEFAULT_YEARS = [5, 10, 20, 40]
+DEFAULT_FREQS = ['D', 'M']
+
+QUICK_ASSETS = [3, 30]
+QUICK_YEARS = [5, 10]
+
+# 데이터 주기별 연간 관측치 수와 rolling_analysis 설정
+PERIODS_PER_YEAR = {'D': 252, 'M': 12}
+ROLLING_SETTINGS = {'D': {'window': 252, 'step': 21}, 'M': {'window': 36, 'step': 1}}
+
+
+def make_returns(n_obs: int, n_assets: int, freq: str, seed: int = 42) -> pd.DataFrame:
+    """벤치마크용 랜덤 수익률"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('1980-01-01', periods=n_obs, freq='D' if freq == 'D' else 'MS')
+    values = rng.normal(0.0003, 0.01, size=(n_obs, n_assets))
+    return pd.DataFrame(values, index=dates, columns=[f'asset_{i}' for i in range(n_assets)])
+
+
+def benchmark_cases(freq: str) -> Dict[str, Callable]:
+    """
+    측정 대상 메서드 (메서드 이름 → (analyzer, returns)를 받아 실행하는 함수)
+
+    calculate_correlation_spectral은 자산 한 쌍의 호출을 측정하며,
+    모든 쌍에 대한 비용은 결과의 calls 필드(N(N-1)/2)로 환산함
+    """
+    rolling = ROLLING_SETTINGS[freq]
+
+    return {
+        'generate_summary_report':
+            lambda analyzer, returns: analyzer.generate_summary_report(returns),
+        'calculate_volatility_spectral':
+            lambda analyzer, returns: analyzer.calculate_volatility_spectral(returns),
+        'calculate_correlation_spectral':
+            lambda analyzer, returns: analyzer.calculate_correlation_spectral(
+                returns.iloc[:, 0], returns.iloc[:, -1]),
+        'rolling_analysis':
+            lambda analyzer, returns: analyzer.rolling_analysis(returns, **rolling),
+        'decompose_frequency_bands':
+            lambda analyzer, returns: analyzer.decompose_frequency_bands(returns),
+        'generate_stl_summary':
+            lambda analyzer, returns: analyzer.generate_stl_summary(returns),
+    }
+
+
+def measure(func: Callable, freq: str, returns: pd.DataFrame, repeats: int = 1) -> Dict:
+    """
+    실행 시간(최솟값)과 최대 메모리 측정
+
+    매 실행마다 새 analyzer를 만들어 캐시 효과 없이(cold) 측정하고,
+    메모리는 tracemalloc 오버헤드가 시간에 섞이지 않도록 별도 실행으로 측정
+    """
+    timings = []
+    for _ in range(repeats):
+        analyzer = FrequencyDomainAnalyzer(sampling_frequency=freq)
+        start = time.perf_counter()
+        func(analyzer, returns)
+        timings.append(time.perf_counter() - start)
+
+    analyzer = FrequencyDomainAnalyzer(sampling_frequency=freq)
+    tracemalloc.start()
+    func(analyzer, returns)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_mb': peak / 1024 ** 2}
+
+
+def run_benchmarks(assets: List[int], years: List[int], freqs: List[str],
+                   methods: List[str] = None, repeats: int = 1,
+                   max_seconds: float = 60.0, out=sys.stdout) -> List[Dict]:
+    """
+    벤치마크 스윕 실행 (결과는 한 줄에 하나씩 JSON으로 out에 기록)
+
+    한 메서드가 max_seconds를 넘으면 같은 주기/길이에서 더 많은 자산 수는 건너뜀
+    """
+    unknown = [method for method in methods or [] if method not in benchmark_cases('D')]
+    if unknown:
+        raise ValueError(f"측정할 수 없는 메서드입니다: {unknown}")
+
+    results = []
+
+    # 지연 import(scipy, statsmodels) 시간이 첫 측정에 섞이지 않도록 미리 실행
+    for freq in freqs:
+        warmup = make_returns(PERIODS_PER_YEAR[freq] * 5, 2, freq)
+        for func in benchmark_cases(freq).values():
+            func(FrequencyDomainAnalyzer(sampling_frequency=freq), warmup)
+
+    for freq in freqs:
+        cases = benchmark_cases(freq)
+        selected = methods or list(cases.keys())
+
+        for n_years in years:
+            n_obs = n_years * PERIODS_PER_YEAR[freq]
+            over_budget = set()
+
+            for n_assets in sorted(assets):
+                returns = make_returns(n_obs, n_assets, freq)
+
+                for method in selected:
+                    record = {
+                        'method': method,
+                        'freq': freq,
+                        'years': n_years,
+                        'n_obs': n_obs,
+                        'n_assets': n_assets,
+                        # 전체 자산을 처리하려면 필요한 호출 수 (쌍별/자산별 메서드 환산용)
+                        'calls': {
+                            'calculate_correlation_spectral': n_assets * (n_assets - 1) // 2,
+                        }.get(method, 1),
+                    }
+
+                    if method in over_budget:
+                        record['status'] = 'skipped'
+                    else:
+                        record.update(measure(cases[method], freq, returns, repeats))
+                        record['status'] = 'ok'
+                        if record['seconds'] > max_seconds:
+                            over_budget.add(method)
+
+                    results.append(record)
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    out.flush()
+
+    return results
+
+
+def print_table(results: List[Dict]):
+    """측정 결과 요약 표 출력"""
+    df = pd.DataFrame([r for r in results if r['status'] == 'ok'])
+    if df.empty:
+        return
+    table = df.pivot_table(index=['freq', 'years', 'n_assets'], columns='method',
+                           values='seconds', aggfunc='min')
+    print("\n실행 시간 (초)", file=sys.stderr)
+    print(table.to_string(float_format=lambda x: f"{x:9.4f}"), file=sys.stderr)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="FrequencyDomainAnalyzer 성능 벤치마크")
+    parser.add_argument('--assets', type=int, nargs='+', default=DEFAULT_ASSETS,
+                        help="자산 수 목록")
+    parser.add_argument('--years', type=int, nargs='+', default=DEFAULT_YEARS,
+                        help="데이터 길이(년) 목록")
+    parser.add_argument('--freqs', nargs='+', choices=['D', 'M'], default=DEFAULT_FREQS,
+                        help="데이터 주기 목록")
+    parser.add_argument('--methods', nargs='+', choices=list(benchmark_cases('D')), default=None,
+                        help="측정할 메서드 (기본값: 전체)")
+    parser.add_argument('--repeats', type=int, default=1,
+                        help="반복 횟수 (최솟값 기록)")
+    parser.add_argument('--max-seconds', type=float, default=60.0,
+                        help="이 시간을 넘긴 메서드는 더 큰 자산 수에서 건너뜀")
+    parser.add_argument('--quick', action='store_true',
+                        help="작은 스윕 (자산 3/30개, 5/10년)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="결과 JSON Lines 파일 (기본값: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    assets = QUICK_ASSETS if args.quick else args.assets
+    years = QUICK_YEARS if args.quick else args.years
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        results = run_benchmarks(assets, years, args.freqs, methods=args.methods,
+                                 repeats=args.repeats, max_seconds=args.max_seconds, out=out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print_table(results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
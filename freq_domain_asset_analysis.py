@@ -6,34 +6,1454 @@ Ortec Finance 방법론 참고
 1. 데이터 길이를 10년으로 증가 (나이퀴스트 정리 충족)
 2. 주파수 대역을 데이터 길이에 맞게 재정의
 3. 순수 랜덤 데이터로 예시 변경
+
+무거운 의존성(matplotlib, statsmodels, scipy.signal, scipy.fft)은 처음 사용할 때
+불러오므로 모듈 import 자체는 numpy/pandas 수준의 시간만 소요됨
+(측정: python -X importtime -c "import freq_domain_asset_analysis")
 """
 
-import numpy as np
-import pandas as pd
-from scipy import signal
-from scipy.fft import fft, fftfreq, ifft
-import matplotlib.pyplot as plt
-from typing import Tuple, Dict, List
-import platform
+import numpy as np
+import pandas as pd
+from typing import Collection, Tuple, Dict, List, Union, Optional
+from functools import lru_cache, wraps
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+import platform
+import tempfile
+import time
+
+# 한글 폰트 설정 (matplotlib으로 그림을 그릴 때만 호출)
+def setup_korean_font():
+    """운영체제에 맞는 한글 폰트 설정"""
+    import matplotlib.pyplot as plt
+
+    system = platform.system()
+    
+    if system == 'Windows':
+        plt.rcParams['font.family'] = 'Malgun Gothic'
+    elif system == 'Darwin':  # macOS
+        plt.rcParams['font.family'] = 'AppleGothic'
+    else:  # Linux
+        try:
+            plt.rcParams['font.family'] = 'NanumGothic'
+        except:
+            pass
+    
+    plt.rcParams['axes.unicode_minus'] = False
+
+
+# 지원하는 수익률 파일 형식
+TABULAR_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.feather', '.arrow', '.ipc')
+SUPPORTED_EXTENSIONS = TABULAR_EXTENSIONS + PARQUET_EXTENSIONS + ARROW_EXTENSIONS
+
+
+def _file_suffix(source, name: str = None) -> str:
+    """확장자 판별 (name이 없으면 source의 경로/name 속성 사용)"""
+    if name is None:
+        name = getattr(source, 'name', str(source))
+    suffix = os.path.splitext(str(name))[1].lower()
+    if suffix not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {name}")
+    return suffix
+
+
+def _rewind(source):
+    """파일 객체면 처음 위치로 되돌림 (헤더/스키마를 먼저 읽은 뒤 재사용)"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _read_arrow_schema(source, suffix: str):
+    """Parquet/Arrow 스키마와 날짜(인덱스) 컬럼 이름 조회 (데이터는 읽지 않음)"""
+    try:
+        import pyarrow.parquet as pq
+        import pyarrow.ipc as ipc
+    except ImportError:
+        raise ImportError("Parquet/Arrow 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow")
+
+    if suffix in PARQUET_EXTENSIONS:
+        schema = pq.read_schema(source)
+    else:
+        schema = ipc.open_file(source).schema
+    _rewind(source)
+
+    # pandas로 저장한 파일이면 메타데이터의 인덱스 컬럼, 아니면 첫 컬럼을 날짜로 사용
+    index_field = schema.names[0]
+    pandas_metadata = schema.pandas_metadata or {}
+    for index_column in pandas_metadata.get('index_columns', []):
+        if isinstance(index_column, str):
+            index_field = index_column
+            break
+
+    return schema, index_field
+
+
+def list_return_columns(source, name: str = None) -> List[str]:
+    """
+    수익률 파일의 자산(컬럼) 목록 조회
+
+    Parquet/Arrow는 스키마만, CSV/Excel은 헤더만 읽음
+    """
+    suffix = _file_suffix(source, name)
+
+    if suffix in TABULAR_EXTENSIONS:
+        if suffix == '.csv':
+            header = pd.read_csv(source, index_col=0, nrows=0)
+        else:
+            header = pd.read_excel(source, index_col=0, nrows=0)
+        _rewind(source)
+        return [str(c) for c in header.columns]
+
+    schema, index_field = _read_arrow_schema(source, suffix)
+    return [c for c in schema.names if c != index_field]
+
+
+def _returns_frame(index, columns: List[str], arrays, dtype) -> pd.DataFrame:
+    """열 배열들을 미리 할당한 연속 실수 블록 하나에 채워 DataFrame으로 감쌈"""
+    block = np.empty((len(index), len(columns)), dtype=dtype, order='F')
+    for j, values in enumerate(arrays):
+        block[:, j] = values
+    return pd.DataFrame(block, index=index, columns=columns, copy=False)
+
+
+def load_returns(source, name: str = None, columns: List[str] = None,
+                 dtype=np.float64) -> pd.DataFrame:
+    """
+    수익률 파일 읽기 (첫 컬럼 = 날짜 인덱스, 나머지 = 자산별 수익률)
+
+    지원 형식: CSV, Excel, Parquet, Arrow IPC/Feather.
+    Parquet/Arrow는 선택한 자산 컬럼만 읽고(column projection),
+    object 컬럼을 거치지 않고 바로 연속된 실수 블록으로 변환
+
+    Parameters:
+    -----------
+    source : str, path or file-like
+        파일 경로 또는 업로드된 파일 객체
+    name : str, optional
+        확장자 판별용 파일명 (None이면 source의 경로/name 속성 사용)
+    columns : List[str], optional
+        읽을 자산 컬럼 (None이면 전체)
+    dtype : np.float64 or np.float32
+        수익률 값의 자료형
+
+    Returns:
+    --------
+    returns : pd.DataFrame
+        날짜 인덱스의 수익률 DataFrame (단일 연속 실수 블록)
+    """
+    suffix = _file_suffix(source, name)
+
+    if suffix in TABULAR_EXTENSIONS:
+        if columns is None:
+            read_kwargs = {}
+        else:
+            # 헤더에서 컬럼 위치를 찾아 날짜 컬럼(0번) + 선택한 자산만 읽음
+            all_columns = list_return_columns(source, name)
+            positions = [0] + [all_columns.index(str(c)) + 1 for c in columns]
+            read_kwargs = {'usecols': positions}
+
+        if suffix == '.csv':
+            df = pd.read_csv(source, index_col=0, parse_dates=True, **read_kwargs)
+        else:
+            df = pd.read_excel(source, index_col=0, parse_dates=True, **read_kwargs)
+
+        if columns is not None:
+            df = df[[str(c) for c in columns]]
+        return _returns_frame(df.index, list(df.columns),
+                              (df[c].to_numpy(dtype=dtype) for c in df.columns), dtype)
+
+    import pyarrow as pa
+
+    schema, index_field = _read_arrow_schema(source, suffix)
+    if columns is None:
+        columns = [c for c in schema.names if c != index_field]
+    else:
+        columns = [str(c) for c in columns]
+
+    if suffix in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+        table = pq.read_table(source, columns=[index_field] + columns)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(source, columns=[index_field] + columns)
+
+    index = pd.Index(table.column(index_field).to_pandas(), name=index_field)
+    if not isinstance(index, pd.DatetimeIndex):
+        try:
+            index = pd.DatetimeIndex(pd.to_datetime(index), name=index_field)
+        except (ValueError, TypeError):
+            pass
+    if index_field.startswith('__index_level_'):
+        index.name = None
+
+    # 결측값(null)은 NaN으로 변환
+    target_type = pa.float32() if np.dtype(dtype) == np.float32 else pa.float64()
+    arrays = (
+        table.column(c).cast(target_type).to_numpy()
+        for c in columns
+    )
+    return _returns_frame(index, columns, arrays, dtype)
+
+
+def _count_data_rows(source, suffix: str) -> int:
+    """데이터 행 수 상한 (CSV: 줄 수 - 헤더, Parquet: 메타데이터) - 파일을 메모리에 올리지 않음"""
+    if suffix in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+        n_rows = pq.ParquetFile(source).metadata.num_rows
+        _rewind(source)
+        return n_rows
+
+    n_lines = 0
+    last_byte = b'\n'
+    f = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                break
+            if isinstance(block, str):
+                block = block.encode('utf-8')
+            n_lines += block.count(b'\n')
+            last_byte = block[-1:]
+    finally:
+        if f is not source:
+            f.close()
+    _rewind(source)
+
+    # 마지막 줄에 개행이 없는 경우 포함, 헤더 1줄 제외
+    if last_byte != b'\n':
+        n_lines += 1
+    return max(n_lines - 1, 0)
+
+
+def _allocate_block(n_rows: int, n_cols: int, dtype, use_memmap: bool,
+                    memmap_dir: str = None) -> np.ndarray:
+    """(행 × 자산) 결과 블록 할당 (필요하면 디스크 memmap)"""
+    if not use_memmap:
+        return np.empty((n_rows, n_cols), dtype=dtype, order='F')
+
+    fd, path = tempfile.mkstemp(suffix='.returns', dir=memmap_dir)
+    os.close(fd)
+    block = np.memmap(path, dtype=dtype, mode='w+', shape=(max(n_rows, 1), n_cols), order='F')
+    # 매핑이 유지되는 동안 파일은 살아 있으므로 바로 삭제 (POSIX). Windows에서는 남겨 둠
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    return block[:n_rows]
+
+
+def read_returns_chunked(source, name: str = None, columns: List[str] = None,
+                         dtype=np.float64, memory_limit_mb: float = 256,
+                         memmap_dir: str = None) -> pd.DataFrame:
+    """
+    매우 긴 수익률 파일을 행 블록 단위로 읽기 (메모리 상한 유지)
+
+    파일 전체를 DataFrame으로 만들지 않고 행 블록마다 날짜/숫자 검증 및 실수 변환 후
+    미리 할당한 배열에 채움. 결과가 상한의 절반을 넘거나 memmap_dir을 지정하면
+    결과 배열은 디스크 memmap에 저장되어 RAM은 파싱 중인 블록만 사용함.
+    CSV와 Parquet만 스트리밍하며, 그 외 형식은 load_returns로 읽음
+
+    Parameters:
+    -----------
+    source : str, path or file-like
+        파일 경로 또는 업로드된 파일 객체
+    name : str, optional
+        확장자 판별용 파일명
+    columns : List[str], optional
+        읽을 자산 컬럼 (None이면 전체)
+    dtype : np.float64 or np.float32
+        수익률 값의 자료형
+    memory_limit_mb : float
+        읽는 동안 사용할 최대 메모리 (MB). 날짜 배열과 1행 파싱도 담을 수 없으면 ValueError
+    memmap_dir : str, optional
+        memmap 파일을 만들 디렉터리 (지정하면 항상 memmap 사용)
+
+    Returns:
+    --------
+    returns : pd.DataFrame
+        날짜 인덱스의 수익률 DataFrame (memmap 사용 시 디스크 배열을 그대로 감쌈)
+    """
+    suffix = _file_suffix(source, name)
+    if suffix not in ('.csv',) + PARQUET_EXTENSIONS:
+        return load_returns(source, name=name, columns=columns, dtype=dtype)
+
+    all_columns = list_return_columns(source, name)
+    columns = all_columns if columns is None else [str(c) for c in columns]
+    missing = [c for c in columns if c not in all_columns]
+    if missing:
+        raise ValueError(f"파일에 없는 자산입니다: {missing}")
+
+    n_rows = _count_data_rows(source, suffix)
+    itemsize = np.dtype(dtype).itemsize
+    limit = int(memory_limit_mb * 1024 ** 2)
+
+    # 결과가 상한의 절반을 넘으면 디스크 memmap에 저장
+    result_bytes = n_rows * len(columns) * itemsize
+    date_bytes = n_rows * 8
+    use_memmap = memmap_dir is not None or result_bytes > limit // 2
+    block = _allocate_block(n_rows, len(columns), dtype, use_memmap, memmap_dir)
+    dates = np.empty(n_rows, dtype='datetime64[ns]')
+
+    # 남은 예산으로 블록 크기 결정 (파싱 중 행당 메모리 ≈ 컬럼당 64바이트로 추정)
+    budget = limit - date_bytes - (0 if use_memmap else result_bytes)
+    row_bytes = (len(columns) + 1) * 64
+    if budget < row_bytes:
+        raise ValueError(
+            f"memory_limit_mb={memory_limit_mb}로는 {len(columns)}개 자산 × {n_rows}행을 읽을 수 없습니다 "
+            f"(날짜 {date_bytes / 1024 ** 2:.1f}MB + 1행 파싱 {row_bytes / 1024 ** 2:.3f}MB 이상 필요)"
+        )
+    chunk_rows = int(budget // row_bytes)
+
+    if suffix == '.csv':
+        positions = [0] + [all_columns.index(c) + 1 for c in columns]
+        reader = pd.read_csv(source, index_col=0, usecols=positions, chunksize=chunk_rows,
+                             dtype={c: dtype for c in columns})
+        chunks = ((chunk.index, chunk[columns].to_numpy(dtype=dtype)) for chunk in reader)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        _, index_field = _read_arrow_schema(source, suffix)
+        target_type = pa.float32() if np.dtype(dtype) == np.float32 else pa.float64()
+        batches = pq.ParquetFile(source).iter_batches(batch_size=chunk_rows,
+                                                      columns=[index_field] + columns)
+        chunks = (
+            (batch.column(0).to_pandas(),
+             np.column_stack([batch.column(j + 1).cast(target_type).to_numpy(zero_copy_only=False)
+                              for j in range(len(columns))]))
+            for batch in batches
+        )
+
+    pos = 0
+    index_name = None
+    try:
+        for chunk_index, chunk_values in chunks:
+            n = len(chunk_index)
+            index_name = chunk_index.name
+            if pos + n > n_rows:
+                raise ValueError("파일 행 수가 예상보다 많습니다")
+            dates[pos:pos + n] = pd.to_datetime(chunk_index).to_numpy(dtype='datetime64[ns]')
+            block[pos:pos + n] = chunk_values
+            pos += n
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"{pos + 1}행 이후 블록을 읽는 중 오류가 발생했습니다: {e}") from e
+
+    return pd.DataFrame(block[:pos], index=pd.DatetimeIndex(dates[:pos], name=index_name),
+                        columns=columns, copy=False)
+
+
+def _butter_cutoffs(low_freq: Optional[float], high_freq: Optional[float],
+                    factor: int = 1) -> Optional[Tuple[Union[float, List[float]], str]]:
+    """
+    Butterworth 설계용 정규화 차단 주파수와 필터 종류
+
+    factor배 데시메이션한 샘플링률의 Nyquist 주파수 기준으로 정규화하고 [0.001, 0.95]로 클램핑.
+    클램핑 후 대역이 비어 있으면 None
+    """
+    nyquist = 0.5 / factor  # 정규화된 Nyquist 주파수
+
+    # Low-pass filter
+    if low_freq is None:
+        return min(max(high_freq / nyquist, 0.001), 0.95), 'low'
+
+    # High-pass filter
+    if high_freq is None:
+        return min(max(low_freq / nyquist, 0.001), 0.95), 'high'
+
+    # Band-pass filter
+    low_normalized = min(max(low_freq / nyquist, 0.001), 0.95)
+    high_normalized = min(max(high_freq / nyquist, 0.001), 0.95)
+
+    if low_normalized >= high_normalized:
+        return None
+
+    return [low_normalized, high_normalized], 'band'
+
+
+@lru_cache(maxsize=128)
+def design_butter_filter(low_freq: Optional[float], high_freq: Optional[float],
+                         order: int = 3) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Butterworth 필터 계수 설계 (메모이즈)
+
+    Parameters:
+    -----------
+    low_freq : float or None
+        하한 주파수 (None이면 low-pass)
+    high_freq : float or None
+        상한 주파수 (None이면 high-pass)
+    order : int
+        필터 차수
+
+    Returns:
+    --------
+    coefficients : Tuple[np.ndarray, np.ndarray] or None
+        (b, a) 계수. 클램핑 후 대역이 비어 있으면 None (출력은 0)
+    """
+    from scipy import signal
+
+    cutoffs = _butter_cutoffs(low_freq, high_freq)
+    if cutoffs is None:
+        return None
+
+    return signal.butter(order, cutoffs[0], btype=cutoffs[1])
+
+
+def apply_zero_phase(coefficients: Optional[Tuple[np.ndarray, np.ndarray]],
+                     data: np.ndarray, axis: int = 0) -> np.ndarray:
+    """설계된 계수로 양방향(filtfilt) 필터링. 계수가 None이면 0 반환"""
+    if coefficients is None:
+        return np.zeros_like(data)
+
+    from scipy import signal
+
+    b, a = coefficients
+    return signal.filtfilt(b, a, data, axis=axis)
+
+
+# 다중 샘플링률(multirate) 필터: 데시메이션 후 대역 상한이 이 값(사이클/샘플) 이하가 되도록 배수 결정
+MULTIRATE_MAX_CUTOFF = 1 / 32
+# 데시메이션 안티에일리어싱 FIR 길이 (데시메이션 배수당 탭 수, 짝수)
+MULTIRATE_FIR_WIDTH = 8
+# 데시메이션으로 줄어드는 IIR 연산량(원래 샘플링률의 2차 구간 수 기준)이 이 값 이상일 때만 데시메이션.
+# FIR 데시메이션 + 보간 비용이 2차 구간 약 5개의 양방향 필터링과 비슷함
+# (일별 5040행 × 200자산 실측: 3차에서는 경기순환 3배·장기추세 15배 모두 원래 샘플링률 SOS보다 느림)
+MULTIRATE_MIN_SAVED_SECTIONS = 5
+
+
+def decimation_factor(low_freq: Optional[float], high_freq: Optional[float], order: int = 3) -> int:
+    """
+    대역 경계(사이클/샘플)와 필터 차수에 대한 데시메이션 배수 (1이면 원래 샘플링률에서 필터링)
+
+    상한이 낮아 데시메이션할 수 있어도, 줄어드는 IIR 연산량이 데시메이션/보간 비용보다
+    작으면 (MULTIRATE_MIN_SAVED_SECTIONS 미만) 1
+    """
+    if not high_freq:
+        return 1
+    factor = max(1, int(MULTIRATE_MAX_CUTOFF / high_freq))
+    # Butterworth SOS 구간 수: band-pass는 차수만큼, low-pass는 차수의 절반(올림)
+    n_sections = order if low_freq else -(-order // 2)
+    if n_sections * (1 - 1 / factor) < MULTIRATE_MIN_SAVED_SECTIONS:
+        return 1
+    return factor
+
+
+@lru_cache(maxsize=128)
+def design_multirate_filter(low_freq: Optional[float], high_freq: Optional[float],
+                            order: int = 3, factor: int = 1
+                            ) -> Optional[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """
+    다중 샘플링률 필터 설계 (메모이즈)
+
+    Parameters:
+    -----------
+    low_freq, high_freq : float or None
+        대역 경계 (원래 샘플링률 기준 사이클/샘플, design_butter_filter와 같음)
+    order : int
+        필터 차수
+    factor : int
+        데시메이션 배수
+
+    Returns:
+    --------
+    design : Tuple[np.ndarray, np.ndarray] or None
+        (데시메이션된 샘플링률의 Butterworth SOS 계수, 안티에일리어싱 FIR).
+        factor가 1이면 FIR은 None. 클램핑 후 대역이 비어 있으면 None
+    """
+    from scipy import signal
+
+    cutoffs = _butter_cutoffs(low_freq, high_freq, factor)
+    if cutoffs is None:
+        return None
+
+    sos = signal.butter(order, cutoffs[0], btype=cutoffs[1], output='sos')
+    if factor == 1:
+        return sos, None
+
+    # 통과 대역(상한 ≤ 1/32 사이클/샘플 × factor)과 에일리어싱 대역 사이의 중간을 차단 주파수로 사용
+    fir = signal.firwin(MULTIRATE_FIR_WIDTH * factor + 1, 0.5 / factor,
+                        window=('kaiser', 6.0), fs=1.0)
+    return sos, fir
+
+
+def lagrange_weights(factor: int) -> np.ndarray:
+    """factor배 보간용 4점(3차) 라그랑주 가중치. (위상 × 4) 배열, 기준점은 -1, 0, 1, 2"""
+    x = np.arange(factor) / factor
+    return np.stack([
+        -x * (x - 1) * (x - 2) / 6,
+        (x + 1) * (x - 1) * (x - 2) / 2,
+        -(x + 1) * x * (x - 2) / 2,
+        (x + 1) * x * (x - 1) / 6,
+    ], axis=1)
+
+
+def apply_multirate_zero_phase(low_freq: Optional[float], high_freq: Optional[float],
+                               order: int, data: np.ndarray, axis: int = 0) -> np.ndarray:
+    """
+    저주파 대역의 다중 샘플링률 Zero-Phase 필터링
+
+    데시메이션(안티에일리어싱 FIR) → 낮은 샘플링률에서 양방향 Butterworth 필터링(SOS)
+    → 3차 라그랑주 보간으로 원래 길이 복원.
+    데시메이션 후 차단 주파수가 Nyquist에서 충분히 떨어져 있어 높은 차수도 안정적이며,
+    IIR 필터 연산량은 데시메이션 배수만큼 줄어듦. 데이터가 짧거나, 상한이 높거나,
+    차수가 낮아 데시메이션 비용이 더 큰 대역(decimation_factor 참고)은 원래 샘플링률에서 SOS로 필터링
+
+    Parameters:
+    -----------
+    low_freq, high_freq : float or None
+        대역 경계 (low_freq가 None이면 low-pass, high_freq가 None이면 high-pass)
+    order : int
+        필터 차수
+    data : np.ndarray
+        입력 시계열 (1차원 또는 시간 × 자산 2차원)
+    axis : int
+        필터링할 시간 축
+
+    Returns:
+    --------
+    filtered_data : np.ndarray
+        필터링된 데이터
+    """
+    from scipy import signal
+
+    n_obs = data.shape[axis]
+    factor = decimation_factor(low_freq, high_freq, order)
+    design = design_multirate_filter(low_freq, high_freq, order, factor)
+    if design is None:
+        return np.zeros_like(data)
+
+    # 원래 샘플링률에서 홀수 확장할 길이: FIR 과도 구간 + 데시메이션된 filtfilt의 기본 패딩
+    # (data[0]이 데시메이션 격자에 오도록 factor의 배수). 데이터가 이보다 짧으면 데시메이션하지 않음
+    sos, fir = design
+    pad = (3 * (2 * len(sos) + 1) + MULTIRATE_FIR_WIDTH // 2) * factor
+    if factor > 1 and n_obs <= pad:
+        factor = 1
+        sos, fir = design_multirate_filter(low_freq, high_freq, order, factor)
+
+    if factor == 1:
+        return signal.sosfiltfilt(sos, data, axis=axis)
+
+    data = np.moveaxis(data, axis, 0)
+    extended = np.concatenate([2 * data[:1] - data[pad:0:-1], data,
+                               2 * data[-1:] - data[-2:-pad - 2:-1]])
+
+    # 데시메이션: FIR 중심 지연(half)을 보정하면 low[j]는 extended[j * factor] 위치
+    half = len(fir) // 2
+    low = signal.upfirdn(fir, extended, 1, factor, axis=0)[half // factor:]
+    low = signal.sosfiltfilt(sos, low, axis=0, padlen=0)
+
+    # 보간: 출력 블록 b의 위상 p = Σ_q w[p, q] · low[start + b - 1 + q]
+    start = pad // factor
+    n_blocks = -(-n_obs // factor)
+    taps = np.stack([low[start - 1 + q:start - 1 + q + n_blocks] for q in range(4)])
+    filtered = np.empty((n_blocks, factor) + data.shape[1:])
+    np.einsum('pq,qb...->bp...', lagrange_weights(factor), taps, out=filtered)
+    filtered = filtered.reshape((n_blocks * factor,) + data.shape[1:])[:n_obs]
+
+    return np.moveaxis(filtered, 0, axis)
+
+
+class FilterBank:
+    """
+    주파수 대역별 Butterworth 필터 계수 묶음
+
+    (sampling_frequency, 대역 경계, 차수)마다 한 번만 설계되며
+    get_filter_bank()를 통해 메모이즈되어 재사용됨.
+    multirate=True이면 저주파 대역을 데시메이션 후 필터링 (apply_multirate_zero_phase)
+    """
+
+    def __init__(self, sampling_frequency: str,
+                 band_edges: Tuple[Tuple[str, Optional[float], Optional[float]], ...],
+                 order: int = 3, multirate: bool = False):
+        """
+        Parameters:
+        -----------
+        sampling_frequency : str
+            데이터 빈도 ('D', 'M' 등)
+        band_edges : Tuple[Tuple[str, float, float], ...]
+            (대역 이름, low_freq, high_freq) 튜플. low_freq가 None이면 low-pass
+        order : int
+            필터 차수
+        multirate : bool
+            다중 샘플링률 필터 사용 여부 (모든 대역을 SOS로 필터링)
+        """
+        self.sampling_frequency = sampling_frequency
+        self.band_edges = band_edges
+        self.order = order
+        self.multirate = multirate
+        self.edges = {band_name: (low_freq, high_freq) for band_name, low_freq, high_freq in band_edges}
+        self.coefficients = {}
+
+        for band_name, low_freq, high_freq in band_edges:
+            try:
+                if multirate:
+                    self.coefficients[band_name] = design_multirate_filter(
+                        low_freq, high_freq, order, decimation_factor(low_freq, high_freq, order))
+                    continue
+                self.coefficients[band_name] = design_butter_filter(low_freq, high_freq, order)
+            except Exception as e:
+                # 설계 실패 시 해당 대역은 0 반환
+                print(f"Warning: Filter failed with low={low_freq}, high={high_freq}: {e}")
+                self.coefficients[band_name] = None
+
+    def apply(self, band_name: str, data: np.ndarray, axis: int = 0) -> np.ndarray:
+        """
+        지정한 대역의 Zero-Phase 필터 적용
+
+        Parameters:
+        -----------
+        band_name : str
+            대역 이름
+        data : np.ndarray
+            입력 시계열 (1차원 또는 시간 × 자산 2차원)
+        axis : int
+            필터링할 시간 축
+
+        Returns:
+        --------
+        filtered_data : np.ndarray
+            필터링된 데이터
+        """
+        try:
+            if self.multirate:
+                if self.coefficients[band_name] is None:
+                    return np.zeros_like(data)
+                low_freq, high_freq = self.edges[band_name]
+                return apply_multirate_zero_phase(low_freq, high_freq, self.order, data, axis=axis)
+            return apply_zero_phase(self.coefficients[band_name], data, axis=axis)
+        except Exception as e:
+            # 필터링 실패 시 0 반환
+            print(f"Warning: Filter failed for band={band_name}: {e}")
+            return np.zeros_like(data)
+
+
+@lru_cache(maxsize=16)
+def get_filter_bank(sampling_frequency: str,
+                    band_edges: Tuple[Tuple[str, Optional[float], Optional[float]], ...],
+                    order: int = 3, multirate: bool = False) -> FilterBank:
+    """(sampling_frequency, 대역 경계, 차수, multirate)별 FilterBank 메모이즈 (LRU 방식으로 오래된 항목 제거)"""
+    return FilterBank(sampling_frequency, band_edges, order, multirate)
+
+
+# 상관계수 행렬 타일 크기와 디스크 memmap으로 전환할 자산 수
+CORRELATION_BLOCK_ASSETS = 512
+CORRELATION_MEMMAP_ASSETS = 4000
+
+
+def correlation_matrix(data: np.ndarray, min_std: float = 1e-10,
+                       block_size: int = CORRELATION_BLOCK_ASSETS,
+                       use_memmap: bool = None, memmap_dir: str = None,
+                       invalid_value: float = 0.0) -> np.ndarray:
+    """
+    (시간 × 자산) 행렬의 열 간 상관계수 행렬을 타일 단위로 계산
+
+    열을 block_size개씩 표준화한 뒤 (i, j) 블록 쌍마다 행렬곱 1회로 상관계수 블록을
+    구해 미리 할당한 결과 배열에 채움 (대칭이므로 j >= i 블록만 계산).
+    N × N 크기의 중간 배열(공분산, 표준편차 외적 등)을 만들지 않음
+
+    calculate_correlation_spectral과 같은 규칙을 따름:
+    표준편차가 min_std 이하인 자산(NaN 포함)과의 상관계수는 invalid_value
+    (대역별 상관계수는 0, 'total'은 np.corrcoef처럼 NaN)
+
+    Parameters:
+    -----------
+    data : np.ndarray
+        (n_obs, n_assets) 형태의 데이터 (float32이면 결과도 float32)
+    min_std : float
+        유효 신호로 볼 최소 표준편차
+    block_size : int
+        타일 한 변의 자산 수
+    use_memmap : bool, optional
+        결과를 디스크 memmap에 저장할지 여부
+        (None이면 자산 수가 CORRELATION_MEMMAP_ASSETS 이상일 때)
+    memmap_dir : str, optional
+        memmap 파일 디렉터리 (None이면 시스템 임시 디렉터리)
+    invalid_value : float
+        무효 자산의 행과 열(대각 원소 제외)에 채울 값
+
+    Returns:
+    --------
+    corr : np.ndarray
+        (n_assets, n_assets) 상관계수 행렬 (np.ndarray 또는 np.memmap)
+    """
+    n_obs, n_assets = data.shape
+    dtype = np.float32 if data.dtype == np.float32 else np.float64
+    if use_memmap is None:
+        use_memmap = n_assets >= CORRELATION_MEMMAP_ASSETS
+    block_size = max(int(block_size), 1)
+    blocks = [slice(start, min(start + block_size, n_assets))
+              for start in range(0, n_assets, block_size)]
+
+    # 표준화: z_i · z_j = 상관계수 (무효 자산은 0 벡터)
+    standardized = np.empty((n_obs, n_assets), dtype=dtype, order='F')
+    invalid = np.zeros(n_assets, dtype=bool)
+    for columns in blocks:
+        block = data[:, columns] - data[:, columns].mean(axis=0)
+        with np.errstate(invalid='ignore', over='ignore'):
+            std = np.sqrt(np.einsum('ij,ij->j', block, block) / n_obs)
+        valid = std > min_std
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            block /= std * np.sqrt(n_obs)
+        block[:, ~valid] = 0.0
+        standardized[:, columns] = block
+        invalid[columns] = ~valid
+
+    corr = _allocate_block(n_assets, n_assets, dtype, use_memmap, memmap_dir)
+    for i, rows in enumerate(blocks):
+        left = standardized[:, rows]
+        for columns in blocks[i:]:
+            tile = left.T @ standardized[:, columns]
+            np.clip(tile, -1.0, 1.0, out=tile)
+            corr[rows, columns] = tile
+            if columns != rows:
+                corr[columns, rows] = tile.T
+
+    if invalid_value != 0.0 and invalid.any():
+        invalid = np.flatnonzero(invalid)
+        corr[invalid, :] = invalid_value
+        corr[:, invalid] = invalid_value
+        corr[invalid, invalid] = 1.0
+
+    return corr
+
+
+def labelled_matrix(values: np.ndarray, labels) -> pd.DataFrame:
+    """정방 행렬을 복사 없이 자산명 인덱스/컬럼의 DataFrame으로 감싸기"""
+    return pd.DataFrame(values, index=labels, columns=labels, copy=False)
+
+
+def stl_components(values: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    STL 적합 후 (trend, seasonal, residual) 배열 반환
+
+    프로세스 풀 워커에서도 호출되므로 pd.Series 대신 배열만 주고받음
+    """
+    from statsmodels.tsa.seasonal import STL
+
+    result = STL(values, period=period, seasonal=13).fit()
+    return result.trend, result.seasonal, result.resid
+
+
+def column_fingerprints(returns: pd.DataFrame) -> List[str]:
+    """
+    자산(컬럼)별 내용 해시 (값 + 날짜 인덱스)
+
+    SpectralContext 재사용 여부 판단에 사용하며, 값이나 인덱스가 바뀌면 해시도 바뀜
+    """
+    index_digest = hashlib.blake2b(
+        pd.util.hash_pandas_object(returns.index, index=False).to_numpy().tobytes(),
+        digest_size=16
+    ).digest()
+    # float32 데이터는 float64로 복사하지 않고 그대로 해시
+    values = returns.to_numpy()
+    if values.dtype != np.float32:
+        values = values.astype(np.float64, copy=False)
+    values = np.asfortranarray(values)
+
+    fingerprints = []
+    for j in range(values.shape[1]):
+        h = hashlib.blake2b(index_digest, digest_size=16)
+        h.update(values[:, j].tobytes())
+        fingerprints.append(h.hexdigest())
+    return fingerprints
+
+
+def returns_fingerprint(returns: pd.DataFrame) -> str:
+    """수익률 DataFrame 전체의 내용 해시 (값 + 날짜 인덱스 + 자산명)"""
+    h = hashlib.blake2b(digest_size=16)
+    for name, key in zip(returns.columns, column_fingerprints(returns)):
+        h.update(str(name).encode('utf-8'))
+        h.update(key.encode('ascii'))
+    return h.hexdigest()
+
+
+class ReturnsStore:
+    """
+    메모리 맵 기반 수익률 저장소 (내용 해시별 1회 저장)
+
+    데이터셋마다 <root>/<해시>/ 아래에 날짜(dates.npy), 실수 행렬(values.bin, 열 우선),
+    메타데이터(meta.json)를 저장함. open()은 파일을 읽기 전용 memmap으로 열어
+    복사 없이 DataFrame으로 감싸므로, 같은 데이터셋을 여러 세션/프로세스가 열어도
+    OS 페이지 캐시의 한 벌만 공유함.
+    저장소는 자동으로 비워지지 않으므로 remove() 또는 prune()으로 정리
+    """
+
+    # 중단된 저장(임시 디렉터리)을 정리하기까지 기다리는 시간 (초)
+    STALE_TMP_SECONDS = 60 * 60
+
+    def __init__(self, root: str = None):
+        """
+        Parameters:
+        -----------
+        root : str, optional
+            저장 디렉터리 (None이면 FREQ_ANALYSIS_STORE 환경변수 또는 임시 디렉터리)
+        """
+        if root is None:
+            root = os.environ.get('FREQ_ANALYSIS_STORE',
+                                  os.path.join(tempfile.gettempdir(), 'freq_analysis_store'))
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._path(key), 'meta.json'))
+
+    def keys(self) -> List[str]:
+        """저장된 데이터셋 해시 목록"""
+        return sorted(key for key in os.listdir(self.root) if key in self)
+
+    def size(self, key: str) -> int:
+        """데이터셋이 차지하는 디스크 크기 (바이트)"""
+        path = self._path(key)
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+    def last_used(self, key: str) -> float:
+        """데이터셋을 마지막으로 저장/연 시각 (meta.json의 수정 시각)"""
+        return os.path.getmtime(os.path.join(self._path(key), 'meta.json'))
+
+    def remove(self, key: str):
+        """
+        데이터셋 삭제 (없으면 무시)
+
+        이미 열려 있는 memmap은 POSIX에서는 닫힐 때까지 유효하지만,
+        이후 open()은 실패하므로 사용 중인 키는 지우지 않도록 주의
+        """
+        import shutil
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def prune(self, max_bytes: int = None, max_age_seconds: float = None,
+              keep: Collection[str] = ()) -> List[str]:
+        """
+        오래된 데이터셋 정리 (마지막 사용 시각 기준)
+
+        Parameters:
+        -----------
+        max_bytes : int, optional
+            전체 크기 상한. 넘으면 가장 오래전에 사용한 데이터셋부터 삭제
+        max_age_seconds : float, optional
+            이 시간 동안 사용하지 않은 데이터셋 삭제
+        keep : Collection[str]
+            삭제하지 않을 키 (방금 저장한 데이터셋, 분석 작업이 아직 열지 않은 데이터셋 등)
+
+        Returns:
+        --------
+        removed : List[str]
+            삭제한 데이터셋 해시
+        """
+        import shutil
+
+        now = time.time()
+
+        # 중단된 저장이 남긴 임시 디렉터리 정리
+        for name in os.listdir(self.root):
+            path = self._path(name)
+            if (name.startswith('.') and os.path.isdir(path)
+                    and now - os.path.getmtime(path) > self.STALE_TMP_SECONDS):
+                shutil.rmtree(path, ignore_errors=True)
+
+        entries = []
+        for key in self.keys():
+            try:
+                entries.append((self.last_used(key), key, self.size(key)))
+            except OSError:
+                # 다른 프로세스가 동시에 삭제한 경우
+                continue
+        entries.sort()
+
+        total = sum(size for _, _, size in entries)
+        removed = []
+        for used, key, size in entries:
+            if key in keep:
+                continue
+            expired = max_age_seconds is not None and now - used > max_age_seconds
+            over_budget = max_bytes is not None and total > max_bytes
+            if expired or over_budget:
+                self.remove(key)
+                removed.append(key)
+                total -= size
+
+        return removed
+
+    def put(self, returns: pd.DataFrame, key: str = None) -> str:
+        """
+        수익률을 저장소에 저장 (이미 있으면 건너뜀)
+
+        Parameters:
+        -----------
+        returns : pd.DataFrame
+            날짜 인덱스의 수익률 (float32 또는 float64로 저장).
+            인덱스는 DatetimeIndex 또는 날짜로 변환되는 문자열이어야 함
+
+        Returns:
+        --------
+        key : str
+            데이터셋 해시
+        """
+        if isinstance(returns.index, pd.DatetimeIndex):
+            dates = returns.index
+        elif pd.api.types.is_object_dtype(returns.index) or pd.api.types.is_string_dtype(returns.index):
+            try:
+                dates = pd.DatetimeIndex(pd.to_datetime(returns.index))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"인덱스를 날짜로 변환할 수 없습니다: {e}") from e
+        else:
+            # 정수 인덱스 등은 1970년 기준 나노초로 조용히 바뀌므로 거부
+            raise ValueError(f"날짜 인덱스가 필요합니다 (현재: {returns.index.dtype})")
+
+        if key is None:
+            key = returns_fingerprint(returns)
+        if key in self:
+            # 마지막 사용 시각 갱신 (prune 기준)
+            os.utime(os.path.join(self._path(key), 'meta.json'))
+            return key
+
+        values = returns.to_numpy()
+        dtype = np.float32 if values.dtype == np.float32 else np.float64
+
+        import shutil
+
+        # 임시 디렉터리에 모두 쓴 뒤 이름 변경 (동시에 저장하는 세션이 있어도 안전)
+        tmp_dir = tempfile.mkdtemp(prefix=f'.{key}.', dir=self.root)
+        try:
+            block = np.memmap(os.path.join(tmp_dir, 'values.bin'), dtype=dtype, mode='w+',
+                              shape=(max(len(returns), 1), returns.shape[1]), order='F')
+            block[:len(returns)] = values
+            block.flush()
+            del block
+
+            np.save(os.path.join(tmp_dir, 'dates.npy'), dates.to_numpy(dtype='datetime64[ns]'))
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'columns': [str(c) for c in returns.columns],
+                    'index_name': returns.index.name,
+                    'shape': list(returns.shape),
+                    'dtype': np.dtype(dtype).name
+                }, f, ensure_ascii=False)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        try:
+            os.rename(tmp_dir, self._path(key))
+        except OSError:
+            # 다른 세션이 먼저 저장한 경우
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return key
+
+    def open(self, key: str) -> pd.DataFrame:
+        """
+        저장된 데이터셋을 읽기 전용 memmap 기반 DataFrame으로 열기 (복사 없음)
+
+        Parameters:
+        -----------
+        key : str
+            데이터셋 해시
+
+        Returns:
+        --------
+        returns : pd.DataFrame
+            날짜 인덱스의 수익률 (값은 디스크 memmap을 그대로 참조)
+        """
+        path = self._path(key)
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        try:
+            # 마지막 사용 시각 갱신 (prune 기준)
+            os.utime(os.path.join(path, 'meta.json'))
+        except OSError:
+            pass
+
+        n_rows, n_cols = meta['shape']
+        block = np.memmap(os.path.join(path, 'values.bin'), dtype=meta['dtype'], mode='r',
+                          shape=(max(n_rows, 1), n_cols), order='F')[:n_rows]
+        dates = np.load(os.path.join(path, 'dates.npy'), mmap_mode='r')
+
+        return pd.DataFrame(block, index=pd.DatetimeIndex(dates, name=meta['index_name']),
+                            columns=meta['columns'], copy=False)
+
+
+def one_sided_psd(spectrum: np.ndarray, n_obs: int, n_fft: int = None) -> np.ndarray:
+    """
+    rFFT 스펙트럼을 단측 Power Spectral Density로 변환
+    (signal.periodogram(scaling='density')와 동일)
+
+    Parameters:
+    -----------
+    spectrum : np.ndarray
+        (n_freqs, n_assets) 형태의 평균 제거 rFFT
+    n_obs : int
+        관측치 수 (정규화에 사용)
+    n_fft : int, optional
+        주파수 격자를 만든 길이 (None이면 n_obs). Nyquist 성분 판단에 사용
+    """
+    n_fft = n_obs if n_fft is None else n_fft
+    psd = (spectrum.real ** 2 + spectrum.imag ** 2) / n_obs
+    # 단측 스펙트럼: DC와 (짝수 길이일 때) Nyquist 성분을 제외하고 2배
+    if n_fft % 2 == 0:
+        psd[1:-1] *= 2
+    else:
+        psd[1:] *= 2
+    return psd
+
+
+def cumulative_trapezoid(psd: np.ndarray, freqs: np.ndarray) -> np.ndarray:
+    """
+    PSD의 누적 사다리꼴 적분 (prefix sum, 첫 행은 0)
+
+    대역 [start, stop)의 적분 = cumulative[stop - 1] - cumulative[start]
+    """
+    cumulative = np.zeros_like(psd)
+    if freqs.size > 1:
+        df = np.diff(freqs).astype(psd.dtype)
+        areas = 0.5 * (psd[1:] + psd[:-1]) * df[:, None]
+        np.cumsum(areas, axis=0, out=cumulative[1:])
+    return cumulative
+
+
+def band_integrals(cumulative: np.ndarray, band_slices: Dict[str, slice]) -> np.ndarray:
+    """누적 적분에서 대역별 적분값 (n_bands, n_assets) 계산"""
+    variances = np.zeros((len(band_slices), cumulative.shape[1]), dtype=cumulative.dtype)
+    for i, band in enumerate(band_slices.values()):
+        # 점이 2개 미만이면 적분값 0 (np.trapz와 동일)
+        if band.stop - band.start > 1:
+            variances[i] = cumulative[band.stop - 1] - cumulative[band.start]
+    return variances
+
+
+# FFT 마스크 대역 분해의 전이 구간 반폭 (옥타브, log2 주파수 기준)
+FFT_MASK_TRANSITION = 0.5
+
+
+def _smooth_highpass(freqs: np.ndarray, cutoff: float, width: float) -> np.ndarray:
+    """
+    cutoff 위쪽에서 1, 아래쪽에서 0인 매끄러운 계단 (log2 주파수에서 raised cosine)
+
+    cutoff <= 0이면 모든 주파수(DC 포함)에서 1, cutoff >= 0.5(Nyquist)이면 0
+    """
+    if cutoff <= 0:
+        return np.ones_like(freqs)
+    if cutoff >= 0.5:
+        return np.zeros_like(freqs)
+    with np.errstate(divide='ignore'):
+        x = np.log2(freqs / cutoff) / width
+    return 0.5 * (1.0 + np.sin(0.5 * np.pi * np.clip(x, -1.0, 1.0)))
+
+
+def fft_band_masks(freqs: np.ndarray, freq_bands: Dict[str, Tuple[float, float]],
+                   transition: float = FFT_MASK_TRANSITION) -> np.ndarray:
+    """
+    rFFT 주파수 축 위의 매끄러운 상보 대역 마스크
+
+    대역 (low, high)의 마스크 = H(low) - H(high), H는 _smooth_highpass.
+    대역들이 [0, 0.5]를 빈틈없이 이어서 덮으면 모든 주파수에서 마스크 합이 정확히 1이므로
+    분해된 대역의 합이 원본과 같음. 전이 구간은 이웃 경계와 겹치지 않도록
+    경계 간 거리(옥타브)의 절반 이하로 줄여 마스크가 음수가 되지 않게 함
+
+    Parameters:
+    -----------
+    freqs : np.ndarray
+        rfftfreq 주파수 축
+    freq_bands : Dict[str, Tuple[float, float]]
+        주파수 대역 정의
+    transition : float
+        전이 구간 반폭 (옥타브)
+
+    Returns:
+    --------
+    masks : np.ndarray
+        (n_bands, n_freqs) 형태, 대역 순서는 freq_bands와 같음
+    """
+    cutoffs = sorted({edge for band in freq_bands.values() for edge in band if 0 < edge < 0.5})
+
+    widths = {}
+    for i, cutoff in enumerate(cutoffs):
+        width = transition
+        if i > 0:
+            width = min(width, 0.5 * np.log2(cutoff / cutoffs[i - 1]))
+        if i < len(cutoffs) - 1:
+            width = min(width, 0.5 * np.log2(cutoffs[i + 1] / cutoff))
+        widths[cutoff] = width
+
+    def highpass(cutoff):
+        return _smooth_highpass(freqs, cutoff, widths.get(cutoff, transition))
+
+    return np.array([
+        highpass(low_freq) - highpass(high_freq) for low_freq, high_freq in freq_bands.values()
+    ])
+
+
+class SpectralContext:
+    """
+    수익률 행렬의 공유 스펙트럼 정보
+
+    자산당 rFFT를 한 번만 계산하고 주파수 축과 대역별 인덱스 범위를 함께 보관.
+    같은 수익률 데이터에 대한 변동성/상관계수/분해 계산이 이 객체를 재사용함
+    """
+
+    def __init__(self, data: np.ndarray,
+                 freq_bands: Dict[str, Tuple[float, float]],
+                 column_keys: List[str] = None,
+                 settings_key: tuple = None):
+        """
+        Parameters:
+        -----------
+        data : np.ndarray
+            (n_obs, n_assets) 형태의 수익률. float32이면 스펙트럼/PSD도 단정밀도로 계산
+        freq_bands : Dict[str, Tuple[float, float]]
+            주파수 대역 정의
+        column_keys : List[str], optional
+            자산별 내용 해시 (column_fingerprints). 조회용 캐시가 아니면 생략
+        settings_key : tuple
+            생성 당시의 대역/필터 설정 (설정이 바뀌면 무효화)
+        """
+        self.data = data
+        self.n_obs = data.shape[0]
+        self.freq_bands = freq_bands
+        self.settings_key = settings_key
+        self.column_index = {key: j for j, key in enumerate(column_keys or [])}
+
+        from scipy.fft import rfft, rfftfreq
 
-# 한글 폰트 설정
-def setup_korean_font():
-    """운영체제에 맞는 한글 폰트 설정"""
-    system = platform.system()
-    
-    if system == 'Windows':
-        plt.rcParams['font.family'] = 'Malgun Gothic'
-    elif system == 'Darwin':  # macOS
-        plt.rcParams['font.family'] = 'AppleGothic'
-    else:  # Linux
+        # 평균 제거 후 rFFT (signal.periodogram의 detrend='constant'와 동일)
+        self.mean = data.mean(axis=0)
+        self.freqs = rfftfreq(self.n_obs)
+        self.spectrum = rfft(data - self.mean, axis=0)
+
+        # 대역별 주파수 인덱스 범위: freqs[start:stop] == (freqs >= low) & (freqs <= high)
+        self.band_slices = {}
+        for band_name, (low_freq, high_freq) in freq_bands.items():
+            start = int(np.searchsorted(self.freqs, low_freq, side='left'))
+            stop = int(np.searchsorted(self.freqs, high_freq, side='right'))
+            self.band_slices[band_name] = slice(start, stop)
+
+        self._psd = None
+        self._psd_cumulative = None
+        # 대역별 분해 결과 (n_bands, n_obs, n_assets) - 처음 분해할 때 채워짐
+        self.band_cube = None
+
+    @property
+    def psd(self) -> np.ndarray:
+        """단측 Power Spectral Density (signal.periodogram(scaling='density')와 동일)"""
+        if self._psd is None:
+            self._psd = one_sided_psd(self.spectrum, self.n_obs)
+        return self._psd
+
+    @property
+    def psd_cumulative(self) -> np.ndarray:
+        """
+        PSD의 누적 사다리꼴 적분 (prefix sum, 첫 행은 0)
+
+        대역 [start, stop)의 적분 = psd_cumulative[stop - 1] - psd_cumulative[start]
+        """
+        if self._psd_cumulative is None:
+            self._psd_cumulative = cumulative_trapezoid(self.psd, self.freqs)
+        return self._psd_cumulative
+
+    def band_variances(self, columns: List[int] = None) -> np.ndarray:
+        """
+        모든 대역의 분산(PSD 적분)을 한 번에 계산
+
+        Parameters:
+        -----------
+        columns : List[int], optional
+            계산할 컬럼 위치 (None이면 전체)
+
+        Returns:
+        --------
+        variances : np.ndarray
+            (n_bands, n_assets) 형태, 대역 순서는 band_slices와 같음
+        """
+        cumulative = self.psd_cumulative
+        if columns is not None:
+            cumulative = cumulative[:, columns]
+        return band_integrals(cumulative, self.band_slices)
+
+    def split_bands(self, columns: List[int] = None,
+                    transition: float = FFT_MASK_TRANSITION,
+                    block_size: int = 256) -> np.ndarray:
+        """
+        보관 중인 rFFT에 상보 대역 마스크를 곱하고 역변환하여 대역별로 분해
+
+        자산당 추가 순방향 FFT 없이 (대역 × 자산) 역변환만 수행하며, 평균(DC)은
+        0 주파수를 포함하는 대역(장기)에 더해지므로 대역 합 = 원본 (fft_band_masks 참고)
+
+        Parameters:
+        -----------
+        columns : List[int], optional
+            분해할 컬럼 위치 (None이면 전체)
+        transition : float
+            마스크 전이 구간 반폭 (옥타브)
+        block_size : int
+            한 번에 역변환할 자산 수 (복소수 임시 배열 크기 제한)
+
+        Returns:
+        --------
+        cube : np.ndarray
+            (n_bands, n_obs, n_assets) 형태의 C-contiguous 배열 (dtype은 data와 같음)
+        """
+        from scipy.fft import irfft
+
+        columns = list(range(self.data.shape[1])) if columns is None else list(columns)
+        masks = fft_band_masks(self.freqs, self.freq_bands, transition)
+        masks = masks.astype(self.spectrum.real.dtype)[:, :, None]
+        # 평균은 DC 마스크 비율대로 대역에 배분 (대역이 [0, 0.5]를 덮으면 장기 대역에 전부)
+        dc_share = masks[:, 0, 0]
+
+        cube = np.empty((len(masks), self.n_obs, len(columns)), dtype=self.spectrum.real.dtype)
+        for start in range(0, len(columns), max(block_size, 1)):
+            block = columns[start:start + block_size]
+            # 모든 대역을 한 번의 역변환 호출로 (대역 × 주파수 × 자산)
+            cube[:, :, start:start + len(block)] = irfft(
+                self.spectrum[None, :, block] * masks, n=self.n_obs, axis=1
+            )
+            cube[:, :, start:start + len(block)] += (
+                dc_share[:, None, None] * self.mean[block][None, None, :]
+            )
+        return cube
+
+
+class IncrementalState:
+    """
+    수익률에 새 관측치(행)를 이어 붙일 때 전체 재계산 없이 갱신하는 누적 통계
+
+    - 평균/분산/공분산: 배치별 통계를 병합 (Chan의 병렬 Welford 공식, 정확)
+    - 스펙트럼: 처음 구축한 주파수 격자(k / base_n_obs)에서의 DTFT 합에
+      새 관측치 항만 더하고, 평균 제거는 상수 시계열의 DTFT로 보정
+    - 갱신 비용: 새 관측치 m개당 O(m × 주파수 수 × 자산 수), 전체 길이와 무관
+
+    격자가 실제 길이의 Fourier 격자와 달라 대역별 분산은 전체 재계산과 약간 다르며
+    (빈 수가 적은 저주파 대역일수록 차이가 큼), 실제 길이가 격자 길이보다
+    max_grid_drift 비율 이상 길어지면 그때만 전체 이력으로 스펙트럼을 다시 계산함
+    (spectrum_rebuilds 증가). 평균/공분산은 항상 정확히 병합되므로 다시 계산하지 않음.
+    필터링 기반 결과(대역 분해, 대역별 상관계수)와 STL은 양방향 필터/국소 회귀의
+    끝단 효과로 마지막 구간이 모두 바뀌므로 증분 갱신 대상이 아니며,
+    history()로 전체 이력을 받아 기존 메서드로 계산해야 함
+    """
+
+    def __init__(self, returns: pd.DataFrame,
+                 freq_bands: Dict[str, Tuple[float, float]],
+                 settings_key: tuple = None,
+                 max_grid_drift: float = 0.01):
+        """
+        Parameters:
+        -----------
+        returns : pd.DataFrame
+            초기 수익률 이력 (columns: 자산명)
+        freq_bands : Dict[str, Tuple[float, float]]
+            주파수 대역 정의
+        settings_key : tuple
+            생성 당시의 대역/필터 설정 (설정이 바뀌면 다시 구축)
+        max_grid_drift : float
+            스펙트럼을 다시 계산하지 않고 허용하는 길이 증가 비율 (격자 길이 대비).
+            0이면 새 관측치마다 스펙트럼을 다시 계산하여 전체 재계산과 일치
+        """
+        self.freq_bands = dict(freq_bands)
+        self.settings_key = settings_key
+        self.max_grid_drift = max_grid_drift
+        self.spectrum_rebuilds = 0
+
+        data = returns.to_numpy(dtype=np.float64)
+        self.columns = returns.columns
+        self.last_index = returns.index[-1] if len(returns) else None
+        self._chunks = [returns]
+
+        self.n_obs = data.shape[0]
+        self.mean = data.mean(axis=0)
+        centered = data - self.mean
+        self.comoment = centered.T @ centered
+
+        self._rebuild_spectrum(data)
+
+    def _rebuild_spectrum(self, data: np.ndarray):
+        """전체 이력으로 스펙트럼을 다시 계산하고 주파수 격자를 현재 길이로 고정"""
+        # 이후 관측치는 같은 격자에서 DTFT 항만 추가
+        context = SpectralContext(data, self.freq_bands)
+        self.base_n_obs = self.n_obs
+        self.freqs = context.freqs
+        self.band_slices = context.band_slices
+        # 상수 1 시계열의 DTFT: 격자 위에서는 DC 성분만 n_obs
+        self.kernel = np.zeros(len(self.freqs), dtype=np.complex128)
+        self.kernel[0] = self.n_obs
+        self.raw_spectrum = context.spectrum + self.kernel[:, None] * self.mean
+
+    def history(self) -> pd.DataFrame:
+        """지금까지의 전체 수익률 이력"""
+        if len(self._chunks) > 1:
+            self._chunks = [pd.concat(self._chunks)]
+        return self._chunks[0]
+
+    def append(self, new_returns: pd.DataFrame) -> bool:
+        """
+        새 관측치를 누적 통계에 반영
+
+        Parameters:
+        -----------
+        new_returns : pd.DataFrame
+            마지막 날짜 이후의 수익률 (컬럼은 초기 이력과 같아야 함)
+
+        Returns:
+        --------
+        recomputed : bool
+            격자 차이가 커져 전체 재계산했으면 True
+        """
+        if list(new_returns.columns) != list(self.columns):
+            raise ValueError("새 수익률의 자산 컬럼이 기존 이력과 다릅니다.")
+        if len(new_returns) == 0:
+            return False
+        if self.last_index is not None and new_returns.index[0] <= self.last_index:
+            raise ValueError(f"새 수익률은 마지막 날짜({self.last_index}) 이후여야 합니다.")
+
+        self._chunks.append(new_returns)
+        self.last_index = new_returns.index[-1]
+
+        n_a, n_b = self.n_obs, len(new_returns)
+        n = n_a + n_b
+        values = new_returns.to_numpy(dtype=np.float64)
+
+        # 평균/공동적률 병합
+        batch_mean = values.mean(axis=0)
+        centered = values - batch_mean
+        delta = batch_mean - self.mean
+        self.comoment += centered.T @ centered + np.outer(delta, delta) * (n_a * n_b / n)
+        self.mean = self.mean + delta * (n_b / n)
+        self.n_obs = n
+
+        if n - self.base_n_obs > self.max_grid_drift * self.base_n_obs:
+            self._rebuild_spectrum(self.history().to_numpy(dtype=np.float64))
+            self.spectrum_rebuilds += 1
+            return True
+
+        # 고정 격자 DTFT에 새 관측치 항 추가 (위상은 정수 나머지로 계산해 정밀도 유지)
+        k = np.arange(len(self.freqs))
+        t = np.arange(n_a, n)
+        phase = np.exp(-2j * np.pi * (np.outer(t, k) % self.base_n_obs) / self.base_n_obs)
+        self.raw_spectrum += phase.T @ values
+        self.kernel += phase.sum(axis=0)
+        return False
+
+    def band_variances(self) -> np.ndarray:
+        """현재 길이 기준 대역별 분산 (n_bands, n_assets), 대역 순서는 band_slices와 같음"""
+        spectrum = self.raw_spectrum - self.kernel[:, None] * self.mean
+        psd = one_sided_psd(spectrum, self.n_obs, self.base_n_obs)
+        return band_integrals(cumulative_trapezoid(psd, self.freqs), self.band_slices)
+
+    @property
+    def std(self) -> np.ndarray:
+        """자산별 표준편차 (np.std와 같은 모집단 기준)"""
+        return np.sqrt(np.diag(self.comoment) / self.n_obs)
+
+    def correlation(self, min_std: float = 1e-10) -> np.ndarray:
+        """
+        자산 간 상관계수 행렬 (calculate_band_correlation_matrices의 'total'과 같은 규칙:
+        표준편차가 min_std 이하이거나 결측/무한값이 있는 자산은 NaN, 대각 원소는 1)
+        """
+        std = self.std
+        valid = std > min_std
+        scale = np.where(valid, 1.0 / np.where(valid, std, 1.0), np.nan) / np.sqrt(self.n_obs)
+        with np.errstate(invalid='ignore'):
+            corr = self.comoment * np.outer(scale, scale)
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+
+class AnalysisProfiler:
+    """
+    FrequencyDomainAnalyzer 메서드별 실행 시간 기록
+
+    메서드마다 호출 횟수, 누적 시간(하위 호출 포함), 자체 시간(하위 호출 제외),
+    최대 1회 시간과 최대 입력 크기(관측치 수 × 자산 수)를 모음.
+    기록 비용은 호출당 perf_counter 2회 수준
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Parameters:
+        -----------
+        enabled : bool
+            False이면 기록하지 않음
+        """
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """기록 초기화"""
+        self.records = OrderedDict()
+        self.wall_seconds = 0.0
+        # 진행 중인 호출마다 하위 호출에 쓴 시간 누적
+        self._stack = []
+
+    @staticmethod
+    def _input_size(data) -> Tuple[int, int]:
+        """입력 데이터의 (관측치 수, 자산 수)"""
+        shape = getattr(data, 'shape', None)
+        if not shape:
+            return 0, 0
+        return int(shape[0]), int(shape[1]) if len(shape) > 1 else 1
+
+    @contextmanager
+    def measure(self, method: str, data=None):
+        """with 블록 실행 시간을 method 이름으로 기록"""
+        if not self.enabled:
+            yield
+            return
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
         try:
-            plt.rcParams['font.family'] = 'NanumGothic'
-        except:
-            pass
-    
-    plt.rcParams['axes.unicode_minus'] = False
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            child_seconds = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            else:
+                self.wall_seconds += elapsed
+
+            n_obs, n_assets = self._input_size(data)
+            record = self.records.setdefault(method, {
+                'method': method, 'calls': 0, 'total_seconds': 0.0, 'self_seconds': 0.0,
+                'max_seconds': 0.0, 'n_obs': 0, 'n_assets': 0
+            })
+            record['calls'] += 1
+            record['total_seconds'] += elapsed
+            record['self_seconds'] += elapsed - child_seconds
+            record['max_seconds'] = max(record['max_seconds'], elapsed)
+            record['n_obs'] = max(record['n_obs'], n_obs)
+            record['n_assets'] = max(record['n_assets'], n_assets)
+
+    def to_frame(self) -> pd.DataFrame:
+        """메서드별 기록 표 (자체 시간이 큰 순서)"""
+        columns = ['method', 'calls', 'total_seconds', 'self_seconds',
+                   'max_seconds', 'n_obs', 'n_assets']
+        frame = pd.DataFrame(list(self.records.values()), columns=columns)
+        return frame.sort_values('self_seconds', ascending=False).reset_index(drop=True)
+
+    def to_dict(self) -> Dict:
+        """JSON으로 저장 가능한 기록 (최상위 호출 전체 시간 + 메서드별 기록)"""
+        return {
+            'wall_seconds': self.wall_seconds,
+            'methods': [dict(record) for record in self.records.values()]
+        }
 
-setup_korean_font()
+
+def profiled(method):
+    """FrequencyDomainAnalyzer 메서드의 실행 시간을 self.profiler에 기록하는 데코레이터"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.profiler.measure(method.__name__, args[0] if args else None):
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class FrequencyDomainAnalyzer:
@@ -41,15 +1461,44 @@ class FrequencyDomainAnalyzer:
     Frequency Domain을 활용한 자산 분석 클래스
     Ortec Finance의 Zero-Phase Filter 방법론 기반 (완전 수정 버전)
     """
+
+    # float32 모드에서 한 번에 필터링할 자산 수
+    FILTER_BLOCK_ASSETS = 256
     
-    def __init__(self, sampling_frequency: str = 'D'):
+    def __init__(self, sampling_frequency: str = 'D', n_jobs: int = 1,
+                 dtype=np.float64, band_engine: str = 'filter'):
         """
         Parameters:
         -----------
         sampling_frequency : str
             데이터 빈도 ('D': 일별, 'W': 주별, 'M': 월별)
+        n_jobs : int
+            STL 분해에 사용할 프로세스 수 (1: 직렬 실행, -1: CPU 코어 수)
+        dtype : np.float64 or np.float32
+            계산 정밀도. float32이면 수익률 행렬, 스펙트럼/PSD, 대역 분해 결과,
+            상관계수를 단정밀도로 보관하여 메모리를 절반으로 줄임.
+            IIR 필터 자체는 안정성을 위해 자산 블록 단위로 float64에서 실행하고
+            결과만 float32로 저장하며, STL은 항상 float64로 계산.
+            float64 대비 오차 (일별 수익률 10~40년, 자산 50개 실측의 약 10배 여유):
+            변동성/기대수익률 상대오차 < 1e-4, 상관계수 절대오차 < 5e-5,
+            분해된 대역 시계열 절대오차 < 2e-5 × 수익률 표준편차
+        band_engine : str
+            대역 분해 방식
+            'filter': 대역마다 Zero-Phase Butterworth 필터 (filtfilt, 기존 방식)
+            'fft': 자산당 rFFT 1회 + 매끄러운 상보 마스크 + 역변환.
+                   대역의 합이 원본과 정확히 같고 (부동소수점 오차 수준), 끝단 효과가 없음
+            'multirate': 'filter'와 같은 Butterworth 대역이지만 차수가 높으면 저주파 대역(일별 경기순환/장기추세)은
+                   데시메이션 후 낮은 샘플링률에서 필터링하고 보간으로 복원. 모든 대역을 SOS로
+                   계산하여 filter_order를 높여도 안정적
         """
         self.sampling_freq = sampling_frequency
+        self.n_jobs = n_jobs
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"dtype은 float32 또는 float64여야 합니다: {dtype}")
+        if band_engine not in ('filter', 'fft', 'multirate'):
+            raise ValueError(f"band_engine은 'filter', 'fft' 또는 'multirate'여야 합니다: {band_engine}")
+        self.band_engine = band_engine
         
         # 주파수 대역 정의 (정규화된 주파수: 0~0.5)
         # 일별 데이터 기준 (Nyquist = 0.5)
@@ -67,11 +1516,102 @@ class FrequencyDomainAnalyzer:
                 'business_cycle': (1/60, 1/12),     # 1년~5년
                 'long_term': (0, 1/60)              # 5년 이상
             }
+
+        # 필터 차수 (높으면 불안정, band_engine='multirate'는 SOS로 계산하여 높은 차수도 안정적)
+        self.filter_order = 3
+
+        # 스펙트럼 캐시: 최근 DataFrame 컨텍스트 1개 + 단일 시계열 컨텍스트(LRU)
+        self._spectral_context = None
+        self._series_contexts = OrderedDict()
+        self._max_series_contexts = 32
+
+        # 메서드별 실행 시간 기록
+        self.profiler = AnalysisProfiler()
+
+        # 증분 갱신 상태 (start_incremental로 생성)
+        self._incremental = None
+
+        # 진행 상황 콜백: callback(단계, 완료 수, 전체 수). 자산별 반복이 있는 단계에서 호출
+        self.progress_callback = None
+
+    def _report_progress(self, stage: str, done: int, total: int):
+        """progress_callback이 설정되어 있으면 진행 상황 전달"""
+        if self.progress_callback is not None:
+            self.progress_callback(stage, done, total)
+
+    def _band_settings_key(self) -> tuple:
+        """SpectralContext 무효화 판단용 대역/필터 설정"""
+        return (self.sampling_freq, tuple(self.freq_bands.items()), self.filter_order,
+                self.dtype.str, self.band_engine)
+
+    @profiled
+    def spectral_context(self, returns: Union[pd.Series, pd.DataFrame]
+                         ) -> Tuple[SpectralContext, List[int]]:
+        """
+        수익률에 대한 SpectralContext 조회 (없으면 생성)
+
+        DataFrame으로 만든 컨텍스트는 그 안의 개별 자산(Series) 호출에도 재사용됨.
+        데이터나 대역 설정이 바뀐 경우에만 새로 계산
+
+        Parameters:
+        -----------
+        returns : pd.Series or pd.DataFrame
+            수익률
+
+        Returns:
+        --------
+        context : SpectralContext
+            스펙트럼 컨텍스트
+        columns : List[int]
+            context 안에서 입력 자산들의 컬럼 위치
+        """
+        frame = returns.to_frame() if isinstance(returns, pd.Series) else returns
+        keys = column_fingerprints(frame)
+        settings_key = self._band_settings_key()
+
+        # 대역 설정이 바뀌면 캐시 전체 무효화
+        if self._spectral_context is not None and self._spectral_context.settings_key != settings_key:
+            self._spectral_context = None
+            self._series_contexts.clear()
+
+        context = self._spectral_context
+        if context is not None and all(key in context.column_index for key in keys):
+            return context, [context.column_index[key] for key in keys]
+
+        if isinstance(returns, pd.Series):
+            key = keys[0]
+            context = self._series_contexts.get(key)
+            if context is None or context.settings_key != settings_key:
+                context = SpectralContext(frame.to_numpy(dtype=self.dtype), self.freq_bands,
+                                          keys, settings_key)
+                self._series_contexts[key] = context
+                while len(self._series_contexts) > self._max_series_contexts:
+                    self._series_contexts.popitem(last=False)
+            self._series_contexts.move_to_end(key)
+            return context, [0]
+
+        # memmap 기반 데이터도 복사하지 않도록 메모리 배치는 그대로 사용 (rFFT/필터는 axis 0)
+        context = SpectralContext(frame.to_numpy(dtype=self.dtype),
+                                  self.freq_bands, keys, settings_key)
+        self._spectral_context = context
+        return context, [context.column_index[key] for key in keys]
+
+    @property
+    def filter_bank(self) -> FilterBank:
+        """현재 대역 설정/필터 차수에 맞는 FilterBank (캐시에서 재사용)"""
+        band_edges = tuple(
+            (band_name,) + tuple(self._band_filter_range(band_name, freq_range))
+            for band_name, freq_range in self.freq_bands.items()
+        )
+        return get_filter_bank(self.sampling_freq, band_edges, self.filter_order,
+                               multirate=self.band_engine == 'multirate')
     
+    @profiled
     def zero_phase_filter(self, data: np.ndarray, 
                          low_freq: float = None,
                          high_freq: float = None,
-                         order: int = 3) -> np.ndarray:
+                         order: int = 3,
+                         axis: int = 0) -> np.ndarray:
         """
         Zero-Phase Shift Filter 적용 (Band-pass, Low-pass, High-pass 지원)
         
@@ -85,88 +1625,122 @@ class FrequencyDomainAnalyzer:
             상한 주파수 (None이면 high-pass)
         order : int
             필터 차수 (낮춤 - 너무 높으면 불안정)
+        axis : int
+            필터링할 시간 축 (2차원 입력 시 0: 행 = 시간, 열 = 자산)
             
         Returns:
         --------
         filtered_data : np.ndarray
             필터링된 데이터
         """
-        nyquist = 0.5  # 정규화된 Nyquist 주파수
-        
         # 필터 타입 결정
         if low_freq is None and high_freq is None:
             return data.copy()
         
         try:
-            # Low-pass filter
-            if low_freq is None:
-                high_normalized = high_freq / nyquist
-                high_normalized = min(max(high_normalized, 0.001), 0.95)
-                
-                b, a = signal.butter(order, high_normalized, btype='low')
-            
-            # High-pass filter
-            elif high_freq is None:
-                low_normalized = low_freq / nyquist
-                low_normalized = min(max(low_normalized, 0.001), 0.95)
-                
-                b, a = signal.butter(order, low_normalized, btype='high')
-            
-            # Band-pass filter
-            else:
-                low_normalized = low_freq / nyquist
-                high_normalized = high_freq / nyquist
-                
-                low_normalized = min(max(low_normalized, 0.001), 0.95)
-                high_normalized = min(max(high_normalized, 0.001), 0.95)
-                
-                if low_normalized >= high_normalized:
-                    return np.zeros_like(data)
-                
-                b, a = signal.butter(order, [low_normalized, high_normalized], btype='band')
-            
+            # 계수는 design_butter_filter 캐시에서 재사용
+            coefficients = design_butter_filter(low_freq, high_freq, order)
+
             # Zero-phase filtering (양방향 필터링)
-            filtered_data = signal.filtfilt(b, a, data)
-            
-            return filtered_data
+            return apply_zero_phase(coefficients, data, axis=axis)
             
         except Exception as e:
             # 필터링 실패 시 0 반환
             print(f"Warning: Filter failed with low={low_freq}, high={high_freq}: {e}")
             return np.zeros_like(data)
     
-    def decompose_frequency_bands(self, returns: pd.Series) -> Dict[str, np.ndarray]:
+    def _band_filter_range(self, band_name: str,
+                           freq_range: Tuple[float, float]) -> Tuple[float, float]:
+        """대역 이름/범위를 zero_phase_filter의 (low_freq, high_freq) 인자로 변환"""
+        if band_name == 'long_term':
+            # Long-term: low-pass filter
+            return None, freq_range[1]
+        # 나머지: band-pass filter
+        return freq_range
+
+    @profiled
+    def decompose_frequency_bands(self, returns: Union[pd.Series, pd.DataFrame]
+                                  ) -> Union[Dict[str, np.ndarray], np.ndarray]:
         """
         수익률을 주파수 대역별로 분해
         
         Parameters:
         -----------
-        returns : pd.Series
-            자산 수익률 시계열
+        returns : pd.Series or pd.DataFrame
+            자산 수익률 시계열. DataFrame이면 행렬 모드로 동작하여
+            대역마다 한 번의 필터 호출로 모든 자산을 axis 0 방향으로 필터링
+            (band_engine='fft'이면 공유 rFFT에 대역 마스크를 적용해 역변환)
             
         Returns:
         --------
-        decomposed : Dict[str, np.ndarray]
-            주파수 대역별 분해된 수익률
+        decomposed : Dict[str, np.ndarray] or np.ndarray
+            Series 입력: 주파수 대역별 분해된 수익률
+            DataFrame 입력: (대역 × 시간 × 자산) 형태의 C-contiguous 배열.
+            대역 순서는 self.freq_bands의 키 순서와 같음. 캐시된 배열을 그대로 반환하는
+            경우 읽기 전용이므로 값을 바꾸려면 복사해서 사용
         """
+        context, columns = self.spectral_context(returns)
+
+        if isinstance(returns, pd.DataFrame):
+            if context.band_cube is None:
+                if self.band_engine == 'fft':
+                    context.band_cube = context.split_bands()
+                else:
+                    context.band_cube = self._decompose_frequency_bands_matrix(context.data)
+                # 캐시된 분해 결과는 이후 호출(Series 분해, 대역별 상관계수)과 공유하므로 읽기 전용
+                context.band_cube.flags.writeable = False
+            if columns == list(range(context.data.shape[1])):
+                return context.band_cube
+            return np.ascontiguousarray(context.band_cube[:, :, columns])
+
+        if context.band_cube is not None:
+            j = columns[0]
+            return {
+                band_name: context.band_cube[i, :, j].copy()
+                for i, band_name in enumerate(self.freq_bands.keys())
+            }
+
+        if self.band_engine == 'fft':
+            cube = context.split_bands(columns)
+            return {
+                band_name: cube[i, :, 0]
+                for i, band_name in enumerate(self.freq_bands.keys())
+            }
+
         data = returns.values
+        filter_bank = self.filter_bank
         decomposed = {}
         
-        for band_name, freq_range in self.freq_bands.items():
-            if band_name == 'long_term':
-                # Long-term: low-pass filter
-                filtered = self.zero_phase_filter(data, low_freq=None, 
-                                                 high_freq=freq_range[1])
-            else:
-                # 나머지: band-pass filter
-                low_freq, high_freq = freq_range
-                filtered = self.zero_phase_filter(data, low_freq=low_freq, 
-                                                 high_freq=high_freq)
-            
-            decomposed[band_name] = filtered
+        for band_name in self.freq_bands.keys():
+            decomposed[band_name] = filter_bank.apply(band_name, data).astype(self.dtype, copy=False)
             
         return decomposed
+
+    def _decompose_frequency_bands_matrix(self, data: np.ndarray) -> np.ndarray:
+        """
+        (시간 × 자산) 행렬 전체를 대역별로 분해 (대역당 filtfilt 1회)
+
+        float32 모드에서는 filtfilt의 float64 임시 배열이 커지지 않도록
+        FILTER_BLOCK_ASSETS개 자산씩 나누어 필터링
+
+        Returns:
+        --------
+        cube : np.ndarray
+            (n_bands, n_obs, n_assets) 형태의 C-contiguous 배열 (dtype은 self.dtype)
+        """
+        filter_bank = self.filter_bank
+        cube = np.empty((len(self.freq_bands),) + data.shape, dtype=self.dtype)
+
+        n_assets = data.shape[1]
+        block = n_assets if self.dtype == np.float64 else self.FILTER_BLOCK_ASSETS
+        for start in range(0, n_assets, max(block, 1)):
+            columns = slice(start, start + block)
+            for i, band_name in enumerate(self.freq_bands.keys()):
+                cube[i, :, columns] = filter_bank.apply(band_name, data[:, columns], axis=0)
+
+        return cube
     
+    @profiled
     def calculate_expected_return(self, returns: pd.Series, 
                                  annualize: bool = True) -> Dict[str, float]:
         """
@@ -195,47 +1769,49 @@ class FrequencyDomainAnalyzer:
         
         return expected_returns
     
-    def calculate_volatility_spectral(self, returns: pd.Series, 
-                                     annualize: bool = True) -> Dict[str, float]:
+    @profiled
+    def calculate_volatility_spectral(self, returns: Union[pd.Series, pd.DataFrame], 
+                                     annualize: bool = True
+                                     ) -> Union[Dict[str, float], pd.DataFrame]:
         """
         Power Spectral Density를 이용한 주파수별 변동성 계산
         
         Parameters:
         -----------
-        returns : pd.Series
-            자산 수익률 시계열
+        returns : pd.Series or pd.DataFrame
+            자산 수익률 시계열. DataFrame이면 모든 자산을 한 번에 계산
         annualize : bool
             연율화 여부
             
         Returns:
         --------
-        volatilities : Dict[str, float]
-            주파수 대역별 및 전체 변동성
+        volatilities : Dict[str, float] or pd.DataFrame
+            Series 입력: 주파수 대역별 및 전체 변동성
+            DataFrame 입력: 자산 × (대역 + 'total') 변동성 표
         """
+        if isinstance(returns, pd.DataFrame):
+            return self._calculate_volatility_spectral_matrix(returns, annualize)
+
         data = returns.values
         
-        # Power Spectral Density 계산
-        freqs, psd = signal.periodogram(data, scaling='density')
+        # Power Spectral Density (공유 SpectralContext의 rFFT 재사용)
+        context, (j,) = self.spectral_context(returns)
+        freqs = context.freqs
+        psd = context.psd[:, j]
         
         volatilities = {}
         
         # 주파수 대역별 변동성 (PSD 적분)
-        for band_name, freq_range in self.freq_bands.items():
-            if band_name == 'long_term':
-                # Long-term: 0부터 상한까지
-                mask = (freqs >= 0) & (freqs <= freq_range[1])
-            else:
-                # 나머지: 하한부터 상한까지
-                low_freq, high_freq = freq_range
-                mask = (freqs >= low_freq) & (freqs <= high_freq)
+        for band_name in self.freq_bands.keys():
+            band = context.band_slices[band_name]
             
             # 해당 대역의 분산 (PSD 적분)
-            if np.any(mask):
+            if band.stop > band.start:
                 # NumPy 버전 호환성: trapz 사용 (trapezoid는 NumPy 1.22+에서만 사용 가능)
                 try:
-                    variance = np.trapz(psd[mask], freqs[mask])
+                    variance = np.trapz(psd[band], freqs[band])
                 except AttributeError:
-                    variance = np.trapezoid(psd[mask], freqs[mask])
+                    variance = np.trapezoid(psd[band], freqs[band])
                 std_dev = np.sqrt(abs(variance))
             else:
                 std_dev = 0.0
@@ -256,7 +1832,32 @@ class FrequencyDomainAnalyzer:
         volatilities['total'] = total_vol
         
         return volatilities
+
+    def _calculate_volatility_spectral_matrix(self, returns: pd.DataFrame,
+                                              annualize: bool = True) -> pd.DataFrame:
+        """
+        DataFrame 전체의 주파수별 변동성을 벡터화하여 계산
+        (전체 PSD 1회 + 누적 적분 prefix 배열 + 대역별 시작/끝 인덱스)
+        """
+        context, columns = self.spectral_context(returns)
+
+        band_vol = np.sqrt(np.abs(context.band_variances(columns)))
+        total_vol = np.std(context.data[:, columns], axis=0)
+
+        if annualize and self.sampling_freq == 'D':
+            scale = np.sqrt(252)
+        elif annualize and self.sampling_freq == 'M':
+            scale = np.sqrt(12)
+        else:
+            scale = 1.0
+
+        volatilities = pd.DataFrame(band_vol.T * scale, index=returns.columns,
+                                    columns=list(context.band_slices.keys()))
+        volatilities['total'] = total_vol * scale
+
+        return volatilities
     
+    @profiled
     def calculate_correlation_spectral(self, returns1: pd.Series,
                                       returns2: pd.Series) -> Dict[str, float]:
         """
@@ -307,6 +1908,42 @@ class FrequencyDomainAnalyzer:
 
         return correlations
     
+    @profiled
+    def calculate_band_correlation_matrices(self, returns: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        모든 자산 쌍의 주파수 대역별 상관계수 행렬을 한 번에 계산
+        자산마다 한 번만 분해하고 (대역당 필터 1회), 대역마다 타일 상관계수 엔진 1회.
+        자산 수가 CORRELATION_MEMMAP_ASSETS 이상이면 결과 행렬은 디스크 memmap
+
+        Parameters:
+        -----------
+        returns : pd.DataFrame
+            자산들의 수익률 (columns: 자산명)
+
+        Returns:
+        --------
+        correlations : Dict[str, pd.DataFrame]
+            대역 이름 및 'total' → N×N 상관계수 행렬.
+            'total'에서 상수 자산과 결측/무한값이 있는 자산의 행과 열은 NaN
+            (calculate_correlation_spectral의 np.corrcoef와 같음), 대역별 행렬에서는 0
+        """
+        assets = returns.columns
+        cube = self.decompose_frequency_bands(returns)
+
+        correlations = {}
+        for i, band_name in enumerate(self.freq_bands.keys()):
+            correlations[band_name] = labelled_matrix(correlation_matrix(cube[i]), assets)
+
+        # 전체 상관계수 (시간 영역, 자기 자신과의 상관계수는 항상 1)
+        values = returns.to_numpy(dtype=self.dtype)
+        # 상수 자산과 결측/무한값이 있는 자산은 0(무상관)이 아니라 NaN으로 표시
+        total_corr = correlation_matrix(values, invalid_value=np.nan)
+        np.fill_diagonal(total_corr, 1.0)
+        correlations['total'] = labelled_matrix(total_corr, assets)
+
+        return correlations
+    
+    @profiled
     def rolling_analysis(self, returns: pd.DataFrame, 
                         window: int = 252,
                         step: int = 63) -> pd.DataFrame:
@@ -326,25 +1963,40 @@ class FrequencyDomainAnalyzer:
         --------
         results : pd.DataFrame
             시간에 따른 통계량 변화
+            ('date', '{자산}_vol': 전체 변동성, '{자산}_{대역}_vol': 대역별 변동성)
         """
-        results = []
+        starts = np.arange(0, len(returns) - window, step)
+        results = pd.DataFrame({'date': returns.index[starts + window - 1]})
+        if len(starts) == 0:
+            return results
+        
+        if self.sampling_freq == 'D':
+            scale = np.sqrt(252)
+        elif self.sampling_freq == 'M':
+            scale = np.sqrt(12)
+        else:
+            scale = 1.0
         
-        for start in range(0, len(returns) - window, step):
-            end = start + window
-            window_data = returns.iloc[start:end]
+        columns = {}
+        for asset in returns.columns:
+            data = returns[asset].to_numpy(dtype=self.dtype)
             
-            result_row = {'date': returns.index[end-1]}
+            # (윈도우 크기 × 윈도우 개수) 행렬: 열마다 한 윈도우
+            windows = np.lib.stride_tricks.sliding_window_view(data, window)[starts].T
             
-            # 각 자산의 통계
-            for asset in returns.columns:
-                vol = self.calculate_volatility_spectral(window_data[asset])
-                result_row[f'{asset}_vol'] = vol['total']
+            # 모든 윈도우의 periodogram과 대역 적분을 한 번에 계산
+            context = SpectralContext(windows, self.freq_bands)
+            band_vol = np.sqrt(np.abs(context.band_variances())) * scale
             
-            results.append(result_row)
+            columns[f'{asset}_vol'] = np.std(windows, axis=0) * scale
+            for i, band_name in enumerate(context.band_slices.keys()):
+                columns[f'{asset}_{band_name}_vol'] = band_vol[i]
         
-        return pd.DataFrame(results)
+        return pd.concat([results, pd.DataFrame(columns)], axis=1)
     
-    def generate_summary_report(self, returns: pd.DataFrame) -> pd.DataFrame:
+    @profiled
+    def generate_summary_report(self, returns: pd.DataFrame,
+                                include_band_correlations: bool = False):
         """
         전체 자산군에 대한 요약 리포트 생성
         
@@ -352,50 +2004,151 @@ class FrequencyDomainAnalyzer:
         -----------
         returns : pd.DataFrame
             자산들의 수익률 (columns: 자산명)
+        include_band_correlations : bool
+            True이면 대역별 상관계수 행렬도 함께 반환
             
         Returns:
         --------
         summary : pd.DataFrame
-            자산별 기대수익률, 변동성, 상관계수 요약
+            자산별 기대수익률, 변동성 요약
+        corr_matrix : pd.DataFrame
+            자산 간 전체 상관계수 행렬
+        band_correlations : Dict[str, pd.DataFrame]
+            include_band_correlations=True일 때만 반환.
+            대역 이름 및 'total' → N×N 상관계수 행렬
         """
         assets = returns.columns
-        n_assets = len(assets)
+        
+        # 자산 × 대역 변동성 표 (벡터화 1회)
+        vol_table = self.calculate_volatility_spectral(returns)
         
         # 기대수익률과 변동성
+        expected_returns = {
+            asset: self.calculate_expected_return(returns[asset])['total'] for asset in assets
+        }
+        summary_df = self._summary_frame(assets, expected_returns, vol_table)
+        
+        # 상관계수 행렬 (자산별 분해 1회 + 대역별 행렬 상관계수 1회)
+        band_correlations = self.calculate_band_correlation_matrices(returns)
+        corr_matrix = band_correlations['total']
+        
+        if include_band_correlations:
+            return summary_df, corr_matrix, band_correlations
+        return summary_df, corr_matrix
+
+    def _summary_frame(self, assets, expected_returns: Dict[str, float],
+                       vol_table: pd.DataFrame) -> pd.DataFrame:
+        """자산별 기대수익률/변동성 표 (generate_summary_report의 summary 형식)"""
         summary_data = []
         for asset in assets:
-            exp_ret = self.calculate_expected_return(returns[asset])
-            vol = self.calculate_volatility_spectral(returns[asset])
+            exp_ret = expected_returns[asset]
+            vol = vol_table.loc[asset]
             
             summary_data.append({
                 'Asset': asset,
-                'Expected_Return': exp_ret['total'],
+                'Expected_Return': exp_ret,
                 'Volatility': vol['total'],
-                'Sharpe_Ratio': exp_ret['total'] / vol['total'] if vol['total'] > 0 else 0,
+                'Sharpe_Ratio': exp_ret / vol['total'] if vol['total'] > 0 else 0,
                 'Short_Term_Vol': vol['short_term'],
                 'Medium_Term_Vol': vol['medium_term'],
                 'Business_Cycle_Vol': vol['business_cycle'],
                 'Long_Term_Vol': vol['long_term']
             })
         
-        summary_df = pd.DataFrame(summary_data)
-        
-        # 상관계수 행렬
-        corr_matrix = pd.DataFrame(index=assets, columns=assets)
-        
-        for i, asset1 in enumerate(assets):
-            for j, asset2 in enumerate(assets):
-                if i == j:
-                    corr_matrix.loc[asset1, asset2] = 1.0
-                elif i < j:
-                    corr = self.calculate_correlation_spectral(
-                        returns[asset1], returns[asset2]
-                    )
-                    corr_matrix.loc[asset1, asset2] = corr['total']
-                    corr_matrix.loc[asset2, asset1] = corr['total']
-        
-        return summary_df, corr_matrix.astype(float)
+        return pd.DataFrame(summary_data)
+
+    @profiled
+    def start_incremental(self, returns: pd.DataFrame,
+                          max_grid_drift: float = 0.01) -> IncrementalState:
+        """
+        증분 갱신 시작: 전체 이력으로 누적 통계를 한 번 구축
+
+        이후 append_returns로 새 관측치만 반영하고 incremental_summary로
+        기대수익률/변동성/대역별 변동성/상관계수를 전체 재계산 없이 얻음
+
+        Parameters:
+        -----------
+        returns : pd.DataFrame
+            초기 수익률 이력 (columns: 자산명)
+        max_grid_drift : float
+            스펙트럼을 다시 계산하지 않고 허용하는 길이 증가 비율
+            (기본 1%: 일별 10년이면 약 25일). 이 범위에서 대역별 변동성은 전체 재계산과
+            단기 대역 1% 이내, 저주파 대역 최대 10% 안팎으로 다르며, 0이면 매번 스펙트럼만 다시
+            계산하여 전체 재계산과 일치 (필터링/STL은 여전히 생략).
+            기대수익률, 전체 변동성, 상관계수는 항상 전체 재계산과 일치
+
+        Returns:
+        --------
+        state : IncrementalState
+            누적 통계
+        """
+        self._incremental = IncrementalState(returns, self.freq_bands,
+                                             self._band_settings_key(), max_grid_drift)
+        return self._incremental
+
+    @profiled
+    def append_returns(self, new_returns: pd.DataFrame) -> IncrementalState:
+        """
+        새 관측치(마지막 날짜 이후의 행)를 누적 통계에 반영
+
+        대역 설정이 바뀌었거나 격자 차이가 max_grid_drift를 넘으면 전체 이력으로 다시 구축
+
+        Parameters:
+        -----------
+        new_returns : pd.DataFrame
+            새 수익률 (컬럼은 초기 이력과 같아야 함)
+
+        Returns:
+        --------
+        state : IncrementalState
+            갱신된 누적 통계
+        """
+        state = self._incremental
+        if state is None:
+            raise ValueError("start_incremental()을 먼저 호출하세요.")
 
+        if state.settings_key != self._band_settings_key():
+            state.append(new_returns)
+            return self.start_incremental(state.history(), state.max_grid_drift)
+
+        state.append(new_returns)
+        return state
+
+    @profiled
+    def incremental_summary(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        증분 상태로 요약 리포트 생성 (generate_summary_report와 같은 형식)
+
+        Returns:
+        --------
+        summary : pd.DataFrame
+            자산별 기대수익률, 변동성 요약
+        corr_matrix : pd.DataFrame
+            자산 간 전체 상관계수 행렬
+        """
+        state = self._incremental
+        if state is None:
+            raise ValueError("start_incremental()을 먼저 호출하세요.")
+
+        if self.sampling_freq == 'D':
+            periods = 252
+        elif self.sampling_freq == 'M':
+            periods = 12
+        else:
+            periods = 1
+        scale = np.sqrt(periods)
+
+        band_vol = np.sqrt(np.abs(state.band_variances())) * scale
+        vol_table = pd.DataFrame(band_vol.T, index=state.columns,
+                                 columns=list(state.band_slices.keys()))
+        vol_table['total'] = state.std * scale
+
+        expected_returns = dict(zip(state.columns, state.mean * periods))
+        summary_df = self._summary_frame(state.columns, expected_returns, vol_table)
+
+        return summary_df, labelled_matrix(state.correlation(), state.columns)
+
+    @profiled
     def stl_decomposition(self, returns: pd.Series, period: int = 21) -> Dict[str, pd.Series]:
         """
         STL (Seasonal and Trend decomposition using Loess) 분해
@@ -413,33 +2166,73 @@ class FrequencyDomainAnalyzer:
             'original', 'trend', 'seasonal', 'residual' 시계열
         """
         try:
-            from statsmodels.tsa.seasonal import STL
-
             # STL 분해 수행
-            stl = STL(returns, period=period, seasonal=13)
-            result = stl.fit()
-
-            return {
-                'original': returns,
-                'trend': result.trend,
-                'seasonal': result.seasonal,
-                'residual': result.resid
-            }
+            trend, seasonal, resid = stl_components(returns.to_numpy(dtype=np.float64), period)
+            return self._stl_result(returns, trend, seasonal, resid)
         except Exception as e:
             print(f"STL decomposition failed: {e}")
-            # Fallback: 단순 이동평균을 trend로 사용
-            trend = returns.rolling(window=period, center=True).mean()
-            residual = returns - trend
-            seasonal = pd.Series(0, index=returns.index)
+            return self._stl_fallback(returns, period)
 
-            return {
-                'original': returns,
-                'trend': trend.fillna(0),
-                'seasonal': seasonal,
-                'residual': residual.fillna(0)
-            }
+    def _stl_result(self, returns: pd.Series, trend: np.ndarray,
+                    seasonal: np.ndarray, resid: np.ndarray) -> Dict[str, pd.Series]:
+        """STL 성분 배열을 원본 인덱스의 Series로 변환"""
+        return {
+            'original': returns,
+            'trend': pd.Series(trend, index=returns.index, name='trend'),
+            'seasonal': pd.Series(seasonal, index=returns.index, name='season'),
+            'residual': pd.Series(resid, index=returns.index, name='resid')
+        }
+
+    def _stl_fallback(self, returns: pd.Series, period: int) -> Dict[str, pd.Series]:
+        """STL 실패 시 대체 분해: 단순 이동평균을 trend로 사용"""
+        trend = returns.rolling(window=period, center=True).mean()
+        residual = returns - trend
+        seasonal = pd.Series(0, index=returns.index)
+
+        return {
+            'original': returns,
+            'trend': trend.fillna(0),
+            'seasonal': seasonal,
+            'residual': residual.fillna(0)
+        }
+
+    def _stl_decompose_all(self, returns: pd.DataFrame, period: int) -> Dict[str, Dict[str, pd.Series]]:
+        """
+        모든 자산의 STL 분해 (n_jobs > 1이면 프로세스 풀에서 병렬 실행)
+
+        워커에는 float64 배열만 전달하고, 결과는 자산 순서대로 반환
+        """
+        n_jobs = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        n_assets = len(returns.columns)
+        n_workers = min(n_jobs, n_assets)
+
+        if n_workers <= 1:
+            decomposed = {}
+            for i, asset in enumerate(returns.columns):
+                decomposed[asset] = self.stl_decomposition(returns[asset], period=period)
+                self._report_progress('stl', i + 1, n_assets)
+            return decomposed
+
+        decomposed = {}
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(stl_components, returns[asset].to_numpy(dtype=np.float64), period)
+                for asset in returns.columns
+            ]
+            for i, (asset, future) in enumerate(zip(returns.columns, futures)):
+                try:
+                    trend, seasonal, resid = future.result()
+                    decomposed[asset] = self._stl_result(returns[asset], trend, seasonal, resid)
+                except Exception as e:
+                    print(f"STL decomposition failed: {e}")
+                    decomposed[asset] = self._stl_fallback(returns[asset], period)
+                self._report_progress('stl', i + 1, n_assets)
+
+        return decomposed
 
-    def generate_stl_summary(self, returns: pd.DataFrame, period: int = None) -> pd.DataFrame:
+    @profiled
+    def generate_stl_summary(self, returns: pd.DataFrame, period: int = None,
+                             return_decomposed: bool = False):
         """
         전체 자산에 대한 STL 분해 요약 생성
 
@@ -450,11 +2243,15 @@ class FrequencyDomainAnalyzer:
         period : int, optional
             계절성 주기 (None이면 sampling_frequency에 따라 자동 설정)
             일별: 21 (월별 패턴), 월별: 12 (연별 패턴)
+        return_decomposed : bool
+            True이면 자산별 STL 분해 결과도 함께 반환 (STL을 다시 돌릴 필요 없음)
 
         Returns:
         --------
         summary : pd.DataFrame
             자산별 STL 분해 통계량
+        decomposed : Dict[str, Dict[str, pd.Series]]
+            return_decomposed=True일 때만 반환. 자산명 → stl_decomposition 결과
         """
         # 주기 자동 설정
         if period is None:
@@ -466,9 +2263,10 @@ class FrequencyDomainAnalyzer:
                 period = 12  # 기본값
 
         stl_summary = []
+        decomposed = self._stl_decompose_all(returns, period)
 
         for asset in returns.columns:
-            stl_result = self.stl_decomposition(returns[asset], period=period)
+            stl_result = decomposed[asset]
 
             trend_vol = np.std(stl_result['trend'].dropna())
             seasonal_vol = np.std(stl_result['seasonal'])
@@ -509,6 +2307,8 @@ class FrequencyDomainAnalyzer:
                 'Seasonal_Strength': seasonal_strength
             })
 
+        if return_decomposed:
+            return pd.DataFrame(stl_summary), decomposed
         return pd.DataFrame(stl_summary)
 
 